@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Compares the two ways the Python backend can translate labeled jumps out of
+nested loops: raising temper_core's Label exceptions, and setting a flag and
+breaking out of each loop in turn.
+
+Both versions of the nested-loop scanner below match what PyTranslator
+generates for Temper like
+
+    outer: for (...) {
+      for (...) {
+        if (...) { continue outer; }
+        if (...) { break outer; }
+      }
+    }
+
+Run against the source tree:
+
+    PYTHONPATH=be-py/src/commonMain/resources/lang/temper/be/py/temper-core \\
+        python3 be-py/scripts/bench_labels.py
+"""
+
+import sys
+import timeit
+
+from temper_core import LabelPair
+
+# Lines of tokens. Any line with a "#" is skipped from there on, and "END"
+# stops the scan.
+LINES = [["tok"] * 12 + ["#", "comment"] for _ in range(199)] + [["END"]]
+
+
+def scan_with_exceptions(lines):
+    count = 0
+    i = 0
+    with LabelPair() as outer:
+        while i < len(lines):
+            line = lines[i]
+            i += 1
+            with outer.continuing:
+                j = 0
+                while j < len(line):
+                    tok = line[j]
+                    j += 1
+                    if tok == "#":
+                        outer.continue_()
+                    if tok == "END":
+                        outer.break_()
+                    count += 1
+    return count
+
+
+def scan_with_flags(lines):
+    count = 0
+    i = 0
+    outer_break = False
+    outer_continue = False
+    while i < len(lines):
+        line = lines[i]
+        i += 1
+        j = 0
+        while j < len(line):
+            tok = line[j]
+            j += 1
+            if tok == "#":
+                outer_continue = True
+                break
+            if tok == "END":
+                outer_break = True
+                break
+            count += 1
+        if outer_break:
+            break
+        if outer_continue:
+            outer_continue = False
+            continue
+    return count
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    assert scan_with_exceptions(LINES) == scan_with_flags(LINES)
+    results = {}
+    for scan in (scan_with_exceptions, scan_with_flags):
+        timer = timeit.Timer(lambda: scan(LINES))
+        best = min(timer.repeat(repeat=5, number=number)) / number
+        results[scan.__name__] = best
+        print(f"{scan.__name__:<22} {best * 1e6:>9.1f}us per scan of {len(LINES)} lines")
+    gain = results["scan_with_exceptions"] / results["scan_with_flags"]
+    print(f"flags are {gain:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
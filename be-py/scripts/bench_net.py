@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""
+Measures std_net_send against a local stand-in server, so that changes to
+temper_core's networking can be compared without external services.
+
+The stand-in is an http.server that waits --latency milliseconds before
+answering each request with --body-size bytes.  The benchmark starts
+--requests calls to std_net_send, at most --concurrency at a time as
+Temper code awaiting in a loop would, and reports latency percentiles,
+throughput and the most threads alive at once.
+
+Run against the source tree:
+
+    PYTHONPATH=be-py/src/commonMain/resources/lang/temper/be/py/temper-core \\
+        python3 be-py/scripts/bench_net.py --requests 2000 --concurrency 50
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import temper_core as rt
+
+
+def make_handler(latency, body):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Send headers and body together, so that Nagle's algorithm does not
+        # hold the body back waiting for a delayed ACK.
+        wbufsize = -1
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class ThreadSampler(threading.Thread):
+    "Records the most threads alive at once, including the server's."
+
+    def __init__(self, interval=0.001):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = threading.active_count()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def run(url, requests, concurrency):
+    latencies = []
+    slots = threading.BoundedSemaphore(concurrency)
+    finished = threading.Event()
+    remaining = [requests]
+    lock = threading.Lock()
+
+    def on_text(started):
+        def done(text):
+            text.result()
+            latencies.append(time.perf_counter() - started)
+            slots.release()
+            with lock:
+                remaining[0] -= 1
+                if not remaining[0]:
+                    finished.set()
+
+        return done
+
+    def on_response(started):
+        def done(response):
+            response.result().text.add_done_callback(on_text(started))
+
+        return done
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        slots.acquire()
+        started = time.perf_counter()
+        rt.std_net_send(url, "GET", None, None).add_done_callback(
+            on_response(started)
+        )
+    finished.wait()
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds")
+    parser.add_argument("--body-size", type=int, default=1024, help="bytes")
+    parser.add_argument("--max-per-host", type=int, help="see configure_net")
+    parser.add_argument("--workers", type=int, help="see configure_async")
+    args = parser.parse_args()
+
+    if args.workers is not None:
+        rt.configure_async(max_workers=args.workers)
+    if args.max_per_host is not None:
+        rt.configure_net(max_per_host=args.max_per_host)
+    handler = make_handler(args.latency / 1000, b"x" * args.body_size)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    sampler = ThreadSampler()
+    sampler.start()
+    elapsed, latencies = run(url, args.requests, args.concurrency)
+    sampler.stopped.set()
+    server.shutdown()
+
+    print(f"requests      {args.requests} ({args.concurrency} at a time)")
+    print(f"p50 latency   {percentile(latencies, 0.50) * 1e3:9.2f}ms")
+    print(f"p99 latency   {percentile(latencies, 0.99) * 1e3:9.2f}ms")
+    print(f"throughput    {args.requests / elapsed:9.1f} requests/s")
+    print(f"peak threads  {sampler.peak:6d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+"""
+Measures per-call time of temper_core's comparison and arithmetic helpers,
+comparing the pure Python definitions against temper_core._speedups.
+
+Run against the source tree:
+
+    PYTHONPATH=be-py/src/commonMain/resources/lang/temper/be/py/temper-core \\
+        python3 be-py/scripts/bench_speedups.py
+
+or against an installed mypyc build of temper-core to see the native gain.
+"""
+
+import sys
+import timeit
+
+import temper_core
+from temper_core import _speedups
+
+# Cover the common case plus the nan and signed zero slow paths.
+CASES = {
+    "float_cmp": [(1.5, 2.5), (-0.0, 0.0), (float("nan"), 1.0)],
+    "float_eq": [(1.5, 1.5), (-0.0, 0.0), (float("nan"), 1.0)],
+    "float_lt": [(1.5, 2.5), (-0.0, 0.0), (float("nan"), 1.0)],
+    "generic_cmp": [(1.5, 2.5), ("a", "b"), (3, 4)],
+    "int_clamp": [(12,), (0x1_0000_0000,)],
+}
+
+
+def per_call_ns(fn, args, number):
+    timer = timeit.Timer(lambda: fn(*args))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"_speedups compiled: {_speedups.COMPILED}")
+    print(f"{'helper':<12} {'args':<20} {'temper_core':>12} {'_speedups':>12} {'gain':>7}")
+    for name, arg_lists in CASES.items():
+        # When compiled, temper_core exports the _speedups versions, but it
+        # keeps the definitions that they replaced.
+        slow = temper_core._replaced_helpers.get(name) or getattr(temper_core, name)
+        fast = getattr(_speedups, name)
+        for args in arg_lists:
+            slow_ns = per_call_ns(slow, args, number)
+            fast_ns = per_call_ns(fast, args, number)
+            print(
+                f"{name:<12} {repr(args):<20} {slow_ns:>10.1f}ns {fast_ns:>10.1f}ns"
+                f" {slow_ns / fast_ns:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
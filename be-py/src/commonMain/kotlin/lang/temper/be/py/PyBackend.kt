@@ -578,6 +578,8 @@ class PyBackend private constructor(
                 filePath("README-temper-core.md"),
                 filePath("temper_core", "py.typed"),
                 filePath("temper_core", "__init__.py"),
+                filePath("temper_core", "_net.py"),
+                filePath("temper_core", "_speedups.py"),
                 filePath("temper_core", "regex.py"),
                 filePath("temper_core", "testing.py"),
             ) + when (pythonVersion) {
@@ -32,6 +32,7 @@ import lang.temper.name.DashedIdentifier
 import lang.temper.name.OutName
 import lang.temper.name.ParsedName
 import lang.temper.name.name
+import lang.temper.type.TypeDefinition
 import lang.temper.type.WellKnownTypes
 import lang.temper.type2.DefinedNonNullType
 import lang.temper.type2.Signature2
@@ -77,27 +78,27 @@ internal object PySupportNetwork : SupportNetwork {
             BuiltinOperatorId.GtIntInt -> IntGt
             BuiltinOperatorId.GtFltFlt -> DubGt
             BuiltinOperatorId.GtStrStr -> StrGt
-            BuiltinOperatorId.GtGeneric -> GenericGt
+            BuiltinOperatorId.GtGeneric -> GenericGtInliner
             BuiltinOperatorId.LtIntInt -> IntLt
             BuiltinOperatorId.LtFltFlt -> DubLt
             BuiltinOperatorId.LtStrStr -> StrLt
-            BuiltinOperatorId.LtGeneric -> GenericLt
+            BuiltinOperatorId.LtGeneric -> GenericLtInliner
             BuiltinOperatorId.GeIntInt -> IntGtEq
             BuiltinOperatorId.GeFltFlt -> DubGtEq
             BuiltinOperatorId.GeStrStr -> StrGtEq
-            BuiltinOperatorId.GeGeneric -> GenericGtEq
+            BuiltinOperatorId.GeGeneric -> GenericGtEqInliner
             BuiltinOperatorId.LeIntInt -> IntLtEq
             BuiltinOperatorId.LeFltFlt -> DubLtEq
             BuiltinOperatorId.LeStrStr -> StrLtEq
-            BuiltinOperatorId.LeGeneric -> GenericLtEq
+            BuiltinOperatorId.LeGeneric -> GenericLtEqInliner
             BuiltinOperatorId.EqIntInt -> IntEq
             BuiltinOperatorId.EqFltFlt -> DubEq
             BuiltinOperatorId.EqStrStr -> StrEq
-            BuiltinOperatorId.EqGeneric -> GenericEq
+            BuiltinOperatorId.EqGeneric -> GenericEqInliner
             BuiltinOperatorId.NeIntInt -> IntNotEq
             BuiltinOperatorId.NeFltFlt -> DubNotEq
             BuiltinOperatorId.NeStrStr -> StrNotEq
-            BuiltinOperatorId.NeGeneric -> GenericNotEq
+            BuiltinOperatorId.NeGeneric -> GenericNotEqInliner
             BuiltinOperatorId.DivFltFlt -> ArithDubDiv
             BuiltinOperatorId.DivIntInt -> ArithIntDiv
             BuiltinOperatorId.DivIntInt64 -> ArithInt64Div
@@ -214,6 +215,8 @@ sealed class PySupportCode(
 
 typealias ExprConsumingTreeFactory = (pos: Position, args: List<Py.Expr>) -> Py.Tree
 typealias ExprConsumingTranslatorTreeFactory = (pos: Position, args: List<Py.Expr>, translator: PyTranslator) -> Py.Tree
+typealias TypedExprConsumingTranslatorTreeFactory =
+    (pos: Position, args: List<TypedArg<Py.Expr>>, translator: PyTranslator) -> Py.Tree
 
 class PyInlineSupportCode(
     baseName: String,
@@ -222,6 +225,8 @@ class PyInlineSupportCode(
     needsSelf: Boolean = false,
     private val translatorFactory: ExprConsumingTranslatorTreeFactory? = null,
     private val factory: ExprConsumingTreeFactory? = null,
+    /** Takes precedence over the other factories when argument types are available. */
+    private val typedFactory: TypedExprConsumingTranslatorTreeFactory? = null,
 ) : PySupportCode(
     ParsedName(baseName),
     builtinOperatorId = builtinOperatorId,
@@ -264,11 +269,19 @@ class PyInlineSupportCode(
         arguments: List<TypedArg<Py.Tree>>,
         returnType: Type2,
         translator: PyTranslator,
-    ): Py.Tree = inlineExprsToTree(
-        pos,
-        arguments.map { it.expr as Py.Expr },
-        translator,
-    )
+    ): Py.Tree = if (typedFactory != null && (arity == null || arguments.size in arity)) {
+        typedFactory.invoke(
+            pos,
+            arguments.map { TypedArg(it.expr as Py.Expr, it.type) },
+            translator,
+        )
+    } else {
+        inlineExprsToTree(
+            pos,
+            arguments.map { it.expr as Py.Expr },
+            translator,
+        )
+    }
 
     fun inlineExprsToTree(
         pos: Position,
@@ -282,7 +295,9 @@ class PyInlineSupportCode(
                 "$baseName expects $arity argument(s) but got $arguments",
             )
         } else {
-            factory?.let { it(pos, arguments) } ?: translatorFactory!!(pos, arguments, translator)
+            factory?.let { it(pos, arguments) }
+                ?: translatorFactory?.let { it(pos, arguments, translator) }
+                ?: garbageExpr(pos, "inlineExprsToTree", "$baseName needs typed arguments")
         }
 }
 private fun inlineAttribute(
@@ -530,7 +545,6 @@ val RequireNoStringIndex = PySeparateCode("require_no_string_index", RUNTIME)
 
 val BubbleException = PySeparateCode("RuntimeError", SYS_BUILTINS)
 val LabelContextManager = PySeparateCode("Label", RUNTIME)
-val LabelPairContextManager = PySeparateCode("LabelPair", RUNTIME)
 val GenericIsEmpty = PyInlineSupportCode(
     "generic_is_empty",
     arity = 1,
@@ -573,6 +587,7 @@ val ArithDubNegate = PyInlineSupportCode("arith_dub_negate", 1, BuiltinOperatorI
 }
 val ArithIntTimes = PySeparateCode("int_mul", RUNTIME, BuiltinOperatorId.TimesIntInt)
 val ArithInt64Times = PySeparateCode("int64_mul", RUNTIME, BuiltinOperatorId.TimesIntInt)
+
 val ArithDubTimes = PyInlineSupportCode("arith_dub_times", 2, BuiltinOperatorId.TimesFltFlt) { pos, arg ->
     BinaryOpEnum.Mult(arg[0], arg[1], pos = pos)
 }
@@ -602,6 +617,48 @@ val GenericLt = PySeparateCode("generic_lt", RUNTIME, BuiltinOperatorId.LtGeneri
 val GenericGtEq = PySeparateCode("generic_gt_eq", RUNTIME, BuiltinOperatorId.GeGeneric)
 val GenericGt = PySeparateCode("generic_gt", RUNTIME, BuiltinOperatorId.GtGeneric)
 
+/**
+ * Types whose Python representations are never `float`.
+ * The generic comparison helpers only differ from Python's operators when both
+ * operands are floats, so one operand of these types is enough to use the operator.
+ */
+private val nonFloatTypeDefinitions = setOf<TypeDefinition>(
+    WellKnownTypes.booleanTypeDefinition,
+    WellKnownTypes.intTypeDefinition,
+    WellKnownTypes.int64TypeDefinition,
+    WellKnownTypes.noStringIndexTypeDefinition,
+    WellKnownTypes.stringTypeDefinition,
+    WellKnownTypes.stringIndexTypeDefinition,
+    WellKnownTypes.stringIndexOptionTypeDefinition,
+)
+
+private fun genericComparer(
+    runtime: PySeparateCode,
+    op: BinaryOpEnum,
+): PyInlineSupportCode = PyInlineSupportCode(
+    baseName = "${runtime.baseName.nameText}_inline",
+    arity = 2..2,
+    builtinOperatorId = runtime.builtinOperatorId,
+    typedFactory = { pos, args, t ->
+        if (args.any { it.type.definition in nonFloatTypeDefinitions }) {
+            op(args[0].expr, args[1].expr, pos = pos)
+        } else {
+            Py.Call(
+                pos,
+                t.request(runtime).asPyName(pos.leftEdge),
+                args.map { Py.CallArg(it.expr) },
+            )
+        }
+    },
+)
+
+val GenericEqInliner = genericComparer(GenericEq, BinaryOpEnum.Eq)
+val GenericNotEqInliner = genericComparer(GenericNotEq, BinaryOpEnum.NotEq)
+val GenericLtEqInliner = genericComparer(GenericLtEq, BinaryOpEnum.LtEq)
+val GenericLtInliner = genericComparer(GenericLt, BinaryOpEnum.Lt)
+val GenericGtEqInliner = genericComparer(GenericGtEq, BinaryOpEnum.GtEq)
+val GenericGtInliner = genericComparer(GenericGt, BinaryOpEnum.Gt)
+
 val IntCmp = PyInlineSupportCode("int_cmp", -1, BuiltinOperatorId.EqIntInt) { pos, args ->
     BinaryOpEnum.Sub(args[0], args[1], pos = pos)
 }
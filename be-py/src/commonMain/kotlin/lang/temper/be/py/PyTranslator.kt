@@ -86,6 +86,12 @@ class PyTranslator(
 
     private val generatorDoAwaitNameStack = mutableListOf<PyIdentifierName>()
 
+    /** Labeled loops being translated, innermost last. */
+    private val loopLabels = mutableListOf<LoopLabel>()
+
+    /** How many Python loops enclose the statement being translated. */
+    private var loopDepth = 0
+
     /** Get a name that is backed by support code. */
     fun request(code: PySupportCode): OutName {
         support.add(code)
@@ -777,8 +783,8 @@ class PyTranslator(
                 is TmpL.Expression -> listOf(Py.Assign.simple(name(s.left), expr(rhs)))
             }
 
-        is TmpL.BreakStatement -> listOf(breakStmt(s))
-        is TmpL.ContinueStatement -> listOf(continueStmt(s))
+        is TmpL.BreakStatement -> breakStmt(s)
+        is TmpL.ContinueStatement -> continueStmt(s)
         is TmpL.IfStatement -> translateIf(s)
         is TmpL.LabeledStatement -> labelBlock(s)
         is TmpL.ModuleInitFailed -> listOf(Py.Raise(s.pos, request(ImportError).asPyName(s.pos)))
@@ -923,16 +929,68 @@ class PyTranslator(
 
     private fun translateWhile(
         stmt: TmpL.WhileStatement,
-        wrap: (List<Py.Stmt>) -> List<Py.Stmt> = { it },
-    ): List<Py.Stmt> =
-        listOf(
+    ): List<Py.Stmt> {
+        val test = expr(stmt.test)
+        loopDepth += 1
+        val body = try {
+            translate(stmt.body)
+        } finally {
+            loopDepth -= 1
+        }
+        return listOf(
             Py.While(
                 stmt.pos,
-                test = expr(stmt.test),
-                body = wrap(translate(stmt.body)),
+                test = test,
+                body = body,
                 orElse = listOf(),
             ),
-        )
+        ) + loopLabelFlagChecks(stmt)
+    }
+
+    /**
+     * After [loop] finishes, continues any jump to an enclosing [LoopLabel] that
+     * was flagged inside [loop].
+     */
+    private fun loopLabelFlagChecks(loop: TmpL.WhileStatement): List<Py.Stmt> = buildList {
+        val pos = loop.pos.rightEdge
+        for (loopLabel in loopLabels) {
+            if (loopLabel.depth > loopDepth) {
+                continue // loop is not inside the labeled loop.
+            }
+            val breakFlag = loopLabel.breakFlag?.takeIf { loop.hasBreakTo(loopLabel.labelName) }
+            val continueFlag = loopLabel.continueFlag?.takeIf { loop.hasContinueTo(loopLabel.labelName) }
+            if (loopLabel.depth == loopDepth) {
+                // Back in the labeled loop's body, so finish the jump.
+                if (breakFlag != null) {
+                    add(Py.If(pos, test = breakFlag.asPyName(pos), body = listOf(Py.Break(pos))))
+                }
+                if (continueFlag != null) {
+                    add(
+                        Py.If(
+                            pos,
+                            test = continueFlag.asPyName(pos),
+                            body = listOf(
+                                Py.Assign.simple(continueFlag.asPyName(pos), PyConstant.False.at(pos)),
+                                Py.Continue(pos),
+                            ),
+                        ),
+                    )
+                }
+            } else {
+                // Keep breaking out towards the labeled loop.
+                val flags: List<Py.Expr> = listOfNotNull(breakFlag, continueFlag).map { it.asPyName(pos) }
+                if (flags.isNotEmpty()) {
+                    add(
+                        Py.If(
+                            pos,
+                            test = flags.reduce { a, b -> BinaryOpEnum.BoolOr(a, b, pos = pos) },
+                            body = listOf(Py.Break(pos)),
+                        ),
+                    )
+                }
+            }
+        }
+    }
 
     /** Gets the arg renaming done first for publicly named args. */
     private inline fun translateFunctionDef(
@@ -1243,82 +1301,74 @@ class PyTranslator(
         return stmts
     }
 
-    private fun breakStmt(stmt: TmpL.BreakStatement): Py.Stmt = stmt.label?.let { label ->
-        name(label.id).method("break_").stmt(pos = stmt.pos)
-    } ?: Py.Break(stmt.pos)
-
-    private fun continueStmt(stmt: TmpL.ContinueStatement): Py.Stmt = stmt.label?.let { label ->
-        name(label.id).method("continue_").stmt(pos = stmt.pos)
-    } ?: Py.Continue(stmt.pos)
+    private fun breakStmt(stmt: TmpL.BreakStatement): List<Py.Stmt> {
+        val label = stmt.label ?: return listOf(Py.Break(stmt.pos))
+        val loopLabel = loopLabels.lastOrNull { it.labelName == label.id.name }
+            ?: return listOf(name(label.id).method("break_").stmt(pos = stmt.pos))
+        return loopLabelJump(stmt.pos, loopLabel.breakFlag, loopLabel, Py.Break(stmt.pos))
+    }
 
-    @Suppress("KotlinConstantConditions") // Be explicit about hasBreak, hasContinue for clarity
-    private fun labelBlock(stmt: TmpL.LabeledStatement): List<Py.Stmt> {
-        val label = stmt.label.id
-        return when (val innerStmt = stmt.statement) {
-            is TmpL.WhileStatement -> {
-                val labelName = label.name
-                val hasBreak = stmt.anyChildRecursive {
-                    it is TmpL.BreakStatement && it.label?.id?.name == labelName
-                }
-                val hasContinue = stmt.anyChildRecursive {
-                    it is TmpL.ContinueStatement && it.label?.id?.name == labelName
-                }
+    private fun continueStmt(stmt: TmpL.ContinueStatement): List<Py.Stmt> {
+        val label = stmt.label ?: return listOf(Py.Continue(stmt.pos))
+        val loopLabel = loopLabels.lastOrNull { it.labelName == label.id.name }
+            ?: return listOf(name(label.id).method("continue_").stmt(pos = stmt.pos))
+        return loopLabelJump(stmt.pos, loopLabel.continueFlag, loopLabel, Py.Continue(stmt.pos))
+    }
 
-                var outerWrap: (List<Py.Stmt>) -> List<Py.Stmt> = { it }
-                var innerWrap: (List<Py.Stmt>) -> List<Py.Stmt> = { it }
+    /** A jump to [loopLabel] that is [direct] in its body, or else flagged and broken out of nested loops. */
+    private fun loopLabelJump(pos: Position, flag: OutName?, loopLabel: LoopLabel, direct: Py.Stmt): List<Py.Stmt> =
+        when {
+            loopDepth == loopLabel.depth -> listOf(direct)
+            flag == null -> listOf(garbageStmt(pos, "loopLabelJump", "no flag for jump to ${loopLabel.labelName}"))
+            else -> listOf(
+                Py.Assign.simple(flag.asPyName(pos), PyConstant.True.at(pos)),
+                Py.Break(pos),
+            )
+        }
 
-                if (hasBreak && hasContinue) {
-                    outerWrap = {
-                        listOf(
-                            Py.With.simple(
-                                stmt.pos,
-                                con = request(LabelPairContextManager),
-                                asName = pyNames.name(label),
-                                body = it,
-                            ),
-                        )
-                    }
-                    innerWrap = {
-                        listOf(
-                            Py.With.simple(
-                                stmt.pos,
-                                con = name(label).attribute("continuing", pos = stmt.pos),
-                                asName = null,
-                                body = it,
-                            ),
-                        )
-                    }
-                } else if (hasBreak && !hasContinue) {
-                    outerWrap = {
-                        listOf(
-                            Py.With.simple(
-                                stmt.pos,
-                                con = request(LabelContextManager),
-                                asName = pyNames.name(label),
-                                body = it,
-                            ),
-                        )
-                    }
-                } else if (!hasBreak && hasContinue) {
-                    outerWrap = {
-                        listOf(
-                            Py.Assign.simple(
-                                name(label),
-                                request(LabelContextManager).asRName(stmt.pos).call(pos = innerStmt.pos),
-                            ),
-                        ) + it
-                    }
-                    innerWrap = {
-                        listOf(Py.With.simple(stmt.pos, con = name(label), asName = null, body = it))
-                    }
-                } else if (!hasBreak && !hasContinue) {
-                    // Warn and continue
-                    outerWrap = { listOf(garbageStmt(stmt.pos, "labelBlock", "break/continue $label not found")) + it }
+    /**
+     * Translates a labeled loop so that its labeled jumps become Python's own `break` and
+     * `continue`. Jumps from inside nested loops set a flag and break, and
+     * [loopLabelFlagChecks] after each nested loop carries them the rest of the way.
+     * That avoids raising a [LabelContextManager] for each jump.
+     */
+    private fun loopLabelBlock(stmt: TmpL.LabeledStatement, loop: TmpL.WhileStatement): List<Py.Stmt> {
+        val label = stmt.label.id
+        val labelName = label.name
+        val labelText = pyNames.name(label).outputNameText
+        val nestedLoops = buildList<TmpL.WhileStatement> {
+            loop.body.boundaryDescent {
+                if (it is TmpL.WhileStatement) {
+                    add(it)
                 }
-
-                outerWrap(translateWhile(innerStmt, innerWrap))
+                it !is TmpL.WhileStatement
             }
+        }
+        val breakFlag = if (nestedLoops.any { it.hasBreakTo(labelName) }) {
+            OutName(pyNames.unusedName("${labelText}_break_%d"), sourceName = null)
+        } else {
+            null
+        }
+        val continueFlag = if (nestedLoops.any { it.hasContinueTo(labelName) }) {
+            OutName(pyNames.unusedName("${labelText}_continue_%d"), sourceName = null)
+        } else {
+            null
+        }
+        val loopLabel = LoopLabel(labelName, depth = loopDepth + 1, breakFlag, continueFlag)
+        return buildList {
+            for (flag in listOfNotNull(breakFlag, continueFlag)) {
+                add(Py.Assign.simple(flag.asPyName(stmt.pos), PyConstant.False.at(stmt.pos)))
+            }
+            addAll(loopLabels.stackWithElementIfNotNull(loopLabel) { translateWhile(loop) })
+        }
+    }
+
+    private fun labelBlock(stmt: TmpL.LabeledStatement): List<Py.Stmt> {
+        val label = stmt.label.id
+        return when (val innerStmt = stmt.statement) {
+            is TmpL.WhileStatement -> loopLabelBlock(stmt, innerStmt)
 
+            // Python can only break out of loops, so other statements need a context manager.
             else -> listOf(
                 Py.With.simple(
                     stmt.pos,
@@ -1774,3 +1824,22 @@ private class SupportBatch {
     val support: MutableSet<PySupportCode> = mutableSetOf()
     val sharedSupport: MutableSet<PySupportCode> = mutableSetOf()
 }
+
+/** A labeled loop whose jumps translate to Python's `break` and `continue`. */
+private class LoopLabel(
+    val labelName: ResolvedName,
+    /** The loop depth of the labeled loop's body, where jumps can be direct. */
+    val depth: Int,
+    /** Set by a `break` from a nested loop, or null if there is none. */
+    val breakFlag: OutName?,
+    /** Set by a `continue` from a nested loop, or null if there is none. */
+    val continueFlag: OutName?,
+)
+
+private fun TmpL.Tree.hasBreakTo(labelName: ResolvedName) = anyChildRecursive {
+    it is TmpL.BreakStatement && it.label?.id?.name == labelName
+}
+
+private fun TmpL.Tree.hasContinueTo(labelName: ResolvedName) = anyChildRecursive {
+    it is TmpL.ContinueStatement && it.label?.id?.name == labelName
+}
@@ -9,42 +9,72 @@ Implementation of many of the connected methods in temper.
 # hopefully prove useful when we eventually can use that
 # in line.
 
+import asyncio
+import codecs
+import heapq
+import itertools
+import operator
+import os
+import re
 import sys
 import logging
+import time
+import mmap
 from abc import abstractmethod
 from array import array
-from concurrent.futures import Future, ThreadPoolExecutor
-from functools import cmp_to_key, reduce
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import (
+    CancelledError,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from functools import cmp_to_key, lru_cache, partial, reduce
 from logging import getLogger, INFO
 from math import copysign, inf, isclose, isinf, isnan, nan
 import threading
 from traceback import print_exception
 from typing import (
     Any,
+    AsyncIterator,
     Callable,
+    ClassVar,
     Deque,
     Dict,
     Generator,
     Generic,
     Iterable,
+    Iterator,
     List,
     Mapping,
     MutableSequence,
     NoReturn,
+    Set,
     Optional,
     Protocol,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
     # TypeVarTuple, # since 3.11
     Union,
     cast,
+    overload,
 )
 from sys import float_info
 from datetime import date as Date, datetime, timezone
 from types import MappingProxyType
-import urllib.request
-import urllib.response
+from weakref import WeakKeyDictionary
+
+from . import _net, _speedups
+
+try:
+    # Optional, but used to speed up bulk arithmetic when available.
+    import numpy as _np  # type: ignore
+except ImportError:
+    _np = None
 
 Unset = None
 "Abstraction used for tracking unset args."
@@ -129,8 +159,28 @@ def str_cat(*parts: str) -> str:
     return "".join(map(str, parts))
 
 
+# Generated code bubbles as ordinary control flow, so by default bubble()
+# reuses one RuntimeError per thread, cleared of the traceback and context
+# left from its last raise. Each thread has its own so that bubbles raised
+# concurrently do not overwrite each other's state. Setting
+# TEMPER_CORE_DEBUG_BUBBLES in the environment before import raises a fresh
+# RuntimeError each time instead.
+_debug_bubbles = bool(os.environ.get("TEMPER_CORE_DEBUG_BUBBLES"))
+_thread_bubbles = threading.local()
+
+
 def make_bubble_exception() -> Exception:
-    return RuntimeError()
+    if _debug_bubbles:
+        return RuntimeError()
+    try:
+        exc: RuntimeError = _thread_bubbles.exc
+    except AttributeError:
+        exc = _thread_bubbles.exc = RuntimeError()
+        exc.__suppress_context__ = True
+    # Drop the frames, and any other exception, held from the last raise.
+    exc.__traceback__ = None
+    exc.__context__ = None
+    return exc
 
 
 def bubble() -> Any:
@@ -236,6 +286,38 @@ def generic_gt(left: C, right: C) -> bool:
     return left > right
 
 
+def _ordered_cmp(left: C, right: C) -> int:
+    return (left > right) - (left < right)
+
+
+def _may_hold_float(py_type: Any) -> bool:
+    try:
+        return issubclass(float, py_type)
+    except TypeError:
+        # Not a class we can reason about, such as a typing construct.
+        return True
+
+
+def comparator_for(py_type: type) -> Callable[[Any, Any], int]:
+    """
+    Returns a three way comparison for values of py_type that avoids per call
+    type checks when py_type excludes float.
+    """
+    if py_type is float:
+        return float_cmp
+    return generic_cmp if _may_hold_float(py_type) else _ordered_cmp
+
+
+def equality_for(py_type: type) -> Callable[[Any, Any], bool]:
+    """
+    Returns an equality check for values of py_type that avoids per call type
+    checks when py_type excludes float.
+    """
+    if py_type is float:
+        return float_eq
+    return generic_eq if _may_hold_float(py_type) else operator.eq
+
+
 def arith_dub_div(dividend: float, divisor: float) -> float:
     """
     Performs division on Float64 (python float); dub stands for "double", like
@@ -347,14 +429,33 @@ class InnerLabel(BaseException):
         return exc_val is self
 
 
+# The Symbol for each text.  Symbols are kept for the life of the process,
+# as mypyc compiled classes cannot be weakly referenced.
+_interned_symbols: Dict[str, "Symbol"] = {}
+
+
 class Symbol(object):
-    "A Temper Symbol."
+    """
+    A Temper Symbol.
+
+    Symbols are interned, so there is one Symbol per text, and equality and
+    hashing go by identity.
+    """
 
     __slots__ = ("_text",)
     _text: str
 
-    def __init__(self, text: str) -> None:
-        self._text = text
+    def __new__(cls, text: str) -> "Symbol":
+        symbol = _interned_symbols.get(text)
+        if symbol is None:
+            symbol = super().__new__(cls)
+            symbol._text = text
+            # setdefault is atomic, so threads racing here agree on one.
+            symbol = _interned_symbols.setdefault(text, symbol)
+        return symbol
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (Symbol, (self._text,))
 
     @property
     def text(self) -> str:
@@ -364,10 +465,11 @@ class Symbol(object):
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Symbol):
             raise NotImplementedError()
-        return self._text == other._text
+        return self is other
 
     def __hash__(self) -> int:
-        return hash(self._text)
+        # Identity hashing is consistent with identity equality.
+        return object.__hash__(self)
 
     def __repr__(self) -> str:
         return f"symbol({self.text!r})"
@@ -376,22 +478,139 @@ class Symbol(object):
         return self._text
 
 
+# Any byte with a bit set.
+_nonzero_byte = re.compile(rb"[^\x00]")
+# Compared against to skip runs of zero bytes without copying them.
+_zero_block = bytes(4096)
+
+# The offsets of the set bits in each byte value.
+_bits_of_byte: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256)
+)
+
+
 class DenseBitVector(object):
-    "An expandable bitvector backed by a bytearray."
+    """
+    An expandable bitvector backed by a bytearray.
+
+    Bit i is bit i % 8 of byte i // 8, which is also bit i of the
+    little-endian int of the whole array. Bulk operations convert to and
+    from that int, so they run word at a time in C. A running count of set
+    bits makes truthiness and bit_count O(1).
+
+    open_mmap instead backs the vector with a memory-mapped file.
+    """
+
+    __slots__ = ("_bytearray", "_count")
 
-    __slots__ = ("_bytearray",)
+    # An mmap for vectors from open_mmap.
+    _bytearray: Union[bytearray, mmap.mmap]
+    # None when other processes may change the bits behind our back.
+    _count: Optional[int]
 
     def __init__(self, capacity: int):
         "Capacity is in bits."
         self._bytearray = bytearray((capacity + 7) >> 3)
+        self._count = 0
+
+    @staticmethod
+    def open_mmap(
+        path: Union[str, "os.PathLike[str]"], capacity: int
+    ) -> "DenseBitVector":
+        """
+        A bit vector stored in the file at path, which is created or extended
+        with zero bits to hold at least capacity bits. Changes are visible to
+        every process that maps the same file. Call close, or use the vector
+        as a context manager, to release the mapping.
+        """
+        n_bytes = max((capacity + 7) >> 3, 1)  # Empty files cannot be mapped
+        with open(path, "a+b") as f:
+            if os.fstat(f.fileno()).st_size < n_bytes:
+                f.truncate(n_bytes)
+            mapped = mmap.mmap(f.fileno(), 0)
+        dbv = DenseBitVector(0)
+        dbv._bytearray = mapped
+        dbv._count = None
+        return dbv
+
+    def __enter__(self) -> "DenseBitVector":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        "Writes a mapped vector's changes through to its file."
+        if isinstance(self._bytearray, mmap.mmap):
+            self._bytearray.flush()
+
+    def close(self) -> None:
+        "Unmaps a mapped vector, which must not be used afterwards."
+        if isinstance(self._bytearray, mmap.mmap):
+            self._bytearray.close()
 
     def __bool__(self) -> bool:
         "Test if any bit is set."
-        return bool(rb"\0" in self._bytearray)
+        if self._count is None:
+            return _nonzero_byte.search(self._bytearray) is not None
+        return self._count != 0
 
     def __bytes__(self) -> bytes:
         "Convert the bit vector into a read-only bytes value."
-        return bytes(self._bytearray.rstrip(b"\0"))
+        with memoryview(self._bytearray) as view:
+            with view[: self._used_length(view)] as used:
+                return bytes(used)
+
+    def _used_length(self, view: memoryview) -> int:
+        "The length of view up to and including its last nonzero byte."
+        if self._count == 0:
+            return 0
+        end = len(view)
+        # Mapped vectors can be large with few bits set near the start, so
+        # step back over zero blocks instead of copying the whole buffer.
+        while end > 0:
+            start = max(0, end - len(_zero_block))
+            with view[start:end] as block:
+                if block != _zero_block[: end - start]:
+                    return start + len(block.tobytes().rstrip(b"\0"))
+            end = start
+        return 0
+
+    def as_memoryview(self) -> memoryview:
+        """
+        A writable view of the underlying bytes without copying them.
+        The vector cannot grow while views of an in-memory vector are alive.
+        """
+        return memoryview(self._bytearray)
+
+    def _grow(self, n_bytes: int) -> None:
+        byte_array = self._bytearray
+        if isinstance(byte_array, mmap.mmap):
+            byte_array.resize(n_bytes)
+        else:
+            byte_array.extend(b"\0" * (n_bytes - len(byte_array)))
+
+    def set_bits(self) -> Iterator[int]:
+        "The indices of set bits in ascending order."
+        bits_of_byte = _bits_of_byte
+        byte_array = self._bytearray
+        for match in _nonzero_byte.finditer(byte_array):
+            base = match.start() << 3
+            for bit in bits_of_byte[byte_array[match.start()]]:
+                yield base + bit
+
+    def bit_count(self) -> int:
+        "The number of set bits."
+        if self._count is None:
+            return self._to_int().bit_count()
+        return self._count
+
+    def copy(self) -> "DenseBitVector":
+        "An in-memory copy, even of a mapped vector."
+        result = DenseBitVector(0)
+        result._bytearray = bytearray(self._bytearray)
+        result._count = self.bit_count()
+        return result
 
     def get(self, idx: int) -> bool:
         "Read a bit from the vector as a boolean; or false if out of bounds."
@@ -406,16 +625,85 @@ class DenseBitVector(object):
         "set a bit in the bit vector, expanding the vector as needed."
         if idx < 0:
             raise IndexError()
-        byte_array = self._bytearray
-        byte_size = len(byte_array)
         byte_index = idx >> 3
-        if byte_index >= byte_size:
-            byte_array.extend(b"\0" * (byte_index + 1 - byte_size))
+        if byte_index >= len(self._bytearray):
+            self._grow(byte_index + 1)
+        byte_array = self._bytearray
         mask = 1 << (idx & 7)
+        old = byte_array[byte_index]
         if bit:
-            byte_array[byte_index] |= mask
-        else:
-            byte_array[byte_index] &= ~mask
+            if not old & mask:
+                byte_array[byte_index] = old | mask
+                if self._count is not None:
+                    self._count += 1
+        elif old & mask:
+            byte_array[byte_index] = old & ~mask
+            if self._count is not None:
+                self._count -= 1
+
+    def set_range(self, start: int, end: int, bit: bool) -> None:
+        "Sets or clears the bits from start inclusive to end exclusive."
+        if start < 0:
+            raise IndexError()
+        if not bit:
+            end = min(end, len(self._bytearray) << 3)
+        if end <= start:
+            return
+        lo = start >> 3
+        hi = (end + 7) >> 3
+        if hi > len(self._bytearray):
+            self._grow(hi)
+        byte_array = self._bytearray
+        old = int.from_bytes(byte_array[lo:hi], "little")
+        mask = ((1 << (end - start)) - 1) << (start & 7)
+        new = old | mask if bit else old & ~mask
+        byte_array[lo:hi] = new.to_bytes(hi - lo, "little")
+        if self._count is not None:
+            self._count += new.bit_count() - old.bit_count()
+
+    def next_set_bit(self, start: int) -> int:
+        "The index of the first set bit at or after start, or -1 if none."
+        start = max(start, 0)
+        byte_array = self._bytearray
+        byte_index = start >> 3
+        if byte_index >= len(byte_array):
+            return -1
+        first = byte_array[byte_index] >> (start & 7)
+        if first:
+            return start + (first & -first).bit_length() - 1
+        match = _nonzero_byte.search(byte_array, byte_index + 1)
+        if match is None:
+            return -1
+        byte = byte_array[match.start()]
+        return (match.start() << 3) + (byte & -byte).bit_length() - 1
+
+    def _to_int(self) -> int:
+        return int.from_bytes(self._bytearray, "little")
+
+    def _assign_int(self, value: int) -> None:
+        n_bytes = (value.bit_length() + 7) >> 3
+        if n_bytes > len(self._bytearray):
+            self._grow(n_bytes)
+        byte_array = self._bytearray
+        byte_array[:] = value.to_bytes(len(byte_array), "little")
+        if self._count is not None:
+            self._count = value.bit_count()
+
+    def and_(self, other: "DenseBitVector") -> None:
+        "Keeps only the bits that are also set in other."
+        self._assign_int(self._to_int() & other._to_int())
+
+    def or_(self, other: "DenseBitVector") -> None:
+        "Sets every bit that is set in other."
+        self._assign_int(self._to_int() | other._to_int())
+
+    def xor(self, other: "DenseBitVector") -> None:
+        "Flips every bit that is set in other."
+        self._assign_int(self._to_int() ^ other._to_int())
+
+    def and_not(self, other: "DenseBitVector") -> None:
+        "Clears every bit that is set in other."
+        self._assign_int(self._to_int() & ~other._to_int())
 
 
 # Connected methods
@@ -428,8 +716,15 @@ def int_clamp(i: int) -> int:
     return i if i < 0x8000_0000 else i - 0x1_0000_0000
 
 
+# The arithmetic helpers below repeat int_clamp's range check inline because
+# the extra call costs more than the check in the common, non-overflowing case.
+
+
 def int_add(a: int, b: int) -> int:
-    return int_clamp(a + b)
+    r = a + b
+    if -0x8000_0000 <= r < 0x8000_0000:
+        return r
+    return ((r + 0x8000_0000) & 0xFFFF_FFFF) - 0x8000_0000
 
 
 def int_div(a: int, b: int) -> int:
@@ -441,7 +736,10 @@ def int_div(a: int, b: int) -> int:
 
 
 def int_mul(a: int, b: int) -> int:
-    return int_clamp(a * b)
+    r = a * b
+    if -0x8000_0000 <= r < 0x8000_0000:
+        return r
+    return ((r + 0x8000_0000) & 0xFFFF_FFFF) - 0x8000_0000
 
 
 def int_negate(a: int) -> int:
@@ -451,7 +749,10 @@ def int_negate(a: int) -> int:
 
 
 def int_sub(a: int, b: int) -> int:
-    return int_clamp(a - b)
+    r = a - b
+    if -0x8000_0000 <= r < 0x8000_0000:
+        return r
+    return ((r + 0x8000_0000) & 0xFFFF_FFFF) - 0x8000_0000
 
 
 def int_to_string(num: int, radix: int = 10) -> str:
@@ -488,7 +789,12 @@ def int64_clamp(i: int) -> int:
 
 
 def int64_add(a: int, b: int) -> int:
-    return int64_clamp(a + b)
+    r = a + b
+    if -0x8000_0000_0000_0000 <= r < 0x8000_0000_0000_0000:
+        return r
+    return ((r + 0x8000_0000_0000_0000) & 0xFFFF_FFFF_FFFF_FFFF) - (
+        0x8000_0000_0000_0000
+    )
 
 
 def int64_div(a: int, b: int) -> int:
@@ -500,7 +806,12 @@ def int64_div(a: int, b: int) -> int:
 
 
 def int64_mul(a: int, b: int) -> int:
-    return int64_clamp(a * b)
+    r = a * b
+    if -0x8000_0000_0000_0000 <= r < 0x8000_0000_0000_0000:
+        return r
+    return ((r + 0x8000_0000_0000_0000) & 0xFFFF_FFFF_FFFF_FFFF) - (
+        0x8000_0000_0000_0000
+    )
 
 
 def int64_negate(a: int) -> int:
@@ -510,7 +821,108 @@ def int64_negate(a: int) -> int:
 
 
 def int64_sub(a: int, b: int) -> int:
-    return int64_clamp(a - b)
+    r = a - b
+    if -0x8000_0000_0000_0000 <= r < 0x8000_0000_0000_0000:
+        return r
+    return ((r + 0x8000_0000_0000_0000) & 0xFFFF_FFFF_FFFF_FFFF) - (
+        0x8000_0000_0000_0000
+    )
+
+
+def _wrap_many(
+    results: List[int], low: int, high: int, mask: int
+) -> Sequence[int]:
+    # Most batches never overflow, so check once before wrapping each value.
+    if not results or (low <= min(results) and max(results) < high):
+        return tuple(results)
+    return tuple(((r - low) & mask) + low for r in results)
+
+
+def _int_many_np(
+    op: Callable[[Any, Any], Any], a: Sequence[int], b: Sequence[int], dtype: Any
+) -> Sequence[int]:
+    if len(a) != len(b):
+        raise ValueError()
+    # NumPy fixed width integer arithmetic already wraps around on overflow.
+    with _np.errstate(over="ignore"):
+        result = op(_np.asarray(a, dtype=dtype), _np.asarray(b, dtype=dtype))
+    return tuple(result.tolist())
+
+
+# Below this many elements, conversion to and from NumPy costs more than it saves.
+_np_min_batch = 256
+
+
+def int_add_many(a: Sequence[int], b: Sequence[int]) -> Sequence[int]:
+    "Adds Int32s pairwise with the same wraparound as int_add."
+    if _np is not None and len(a) >= _np_min_batch:
+        return _int_many_np(_np.add, a, b, _np.int32)
+    return _wrap_many(
+        [x + y for x, y in zip(a, b, strict=True)],
+        -0x8000_0000,
+        0x8000_0000,
+        0xFFFF_FFFF,
+    )
+
+
+def int_mul_many(a: Sequence[int], b: Sequence[int]) -> Sequence[int]:
+    "Multiplies Int32s pairwise with the same wraparound as int_mul."
+    if _np is not None and len(a) >= _np_min_batch:
+        return _int_many_np(_np.multiply, a, b, _np.int32)
+    return _wrap_many(
+        [x * y for x, y in zip(a, b, strict=True)],
+        -0x8000_0000,
+        0x8000_0000,
+        0xFFFF_FFFF,
+    )
+
+
+def int_sub_many(a: Sequence[int], b: Sequence[int]) -> Sequence[int]:
+    "Subtracts Int32s pairwise with the same wraparound as int_sub."
+    if _np is not None and len(a) >= _np_min_batch:
+        return _int_many_np(_np.subtract, a, b, _np.int32)
+    return _wrap_many(
+        [x - y for x, y in zip(a, b, strict=True)],
+        -0x8000_0000,
+        0x8000_0000,
+        0xFFFF_FFFF,
+    )
+
+
+def int64_add_many(a: Sequence[int], b: Sequence[int]) -> Sequence[int]:
+    "Adds Int64s pairwise with the same wraparound as int64_add."
+    if _np is not None and len(a) >= _np_min_batch:
+        return _int_many_np(_np.add, a, b, _np.int64)
+    return _wrap_many(
+        [x + y for x, y in zip(a, b, strict=True)],
+        -0x8000_0000_0000_0000,
+        0x8000_0000_0000_0000,
+        0xFFFF_FFFF_FFFF_FFFF,
+    )
+
+
+def int64_mul_many(a: Sequence[int], b: Sequence[int]) -> Sequence[int]:
+    "Multiplies Int64s pairwise with the same wraparound as int64_mul."
+    if _np is not None and len(a) >= _np_min_batch:
+        return _int_many_np(_np.multiply, a, b, _np.int64)
+    return _wrap_many(
+        [x * y for x, y in zip(a, b, strict=True)],
+        -0x8000_0000_0000_0000,
+        0x8000_0000_0000_0000,
+        0xFFFF_FFFF_FFFF_FFFF,
+    )
+
+
+def int64_sub_many(a: Sequence[int], b: Sequence[int]) -> Sequence[int]:
+    "Subtracts Int64s pairwise with the same wraparound as int64_sub."
+    if _np is not None and len(a) >= _np_min_batch:
+        return _int_many_np(_np.subtract, a, b, _np.int64)
+    return _wrap_many(
+        [x - y for x, y in zip(a, b, strict=True)],
+        -0x8000_0000_0000_0000,
+        0x8000_0000_0000_0000,
+        0xFFFF_FFFF_FFFF_FFFF,
+    )
 
 
 def int64_to_float64(value: int) -> float:
@@ -674,8 +1086,8 @@ def string_count_between(s: str, left: int, right: int) -> int:
 
 
 def string_for_each(s: str, f: Callable[[int], None]) -> None:
-    for c in s:
-        f(ord(c))
+    for cp in map(ord, s):
+        f(cp)
 
 
 def string_has_at_least(s: str, left: int, right: int, min_count: int) -> bool:
@@ -691,21 +1103,130 @@ def string_prev(s: str, i: int) -> int:
 
 
 def string_step(s: str, i: int, by: int) -> int:
-    if by >= 0:
-        for _ in range(by):
-            old_i = i
-            i = string_next(s, i)
-            if i == old_i:
-                break
-    else:
-        for _ in range(-by):
-            old_i = i
-            i = string_prev(s, i)
-            if i == old_i:
-                break
+    # Same as repeating string_next or string_prev, which clamp at the ends.
+    if by > 0:
+        return min(len(s), i + by)
+    if by < 0:
+        return max(0, i + by)
     return i
 
 
+@lru_cache(maxsize=64)
+def _code_point_class(chars: str) -> "re.Pattern[str]":
+    if not chars:
+        return re.compile("(?!)")  # Never matches
+    return re.compile(f"[{''.join(map(re.escape, chars))}]")
+
+
+@lru_cache(maxsize=64)
+def _code_point_run(chars: str) -> "re.Pattern[str]":
+    return re.compile(f"{_code_point_class(chars).pattern}*")
+
+
+def _code_point_chars(code_points: Union[str, Iterable[int]]) -> str:
+    if isinstance(code_points, str):
+        return code_points
+    return "".join(map(chr, sorted(set(code_points))))
+
+
+class StringCursor:
+    """
+    A StringIndex into a string with bulk moves, for use by lexers.
+
+    Each move is a single str.find, re match or slice rather than a Python
+    call per code point. Moves clamp at the ends of the string, like
+    string_step.
+    """
+
+    __slots__ = ("_source", "_index")
+
+    _source: str
+    _index: int
+
+    def __init__(self, source: str, index: int = 0) -> None:
+        self._source = source
+        self._index = max(0, min(index, len(source)))
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def at_end(self) -> bool:
+        return self._index >= len(self._source)
+
+    def peek(self) -> int:
+        "The code point at the cursor, or -1 at the end."
+        i = self._index
+        source = self._source
+        return ord(source[i]) if i < len(source) else -1
+
+    def copy(self) -> "StringCursor":
+        return StringCursor(self._source, self._index)
+
+    def advance(self, n: int = 1) -> int:
+        "Moves by n code points, backwards if negative; returns the distance moved."
+        old = self._index
+        self._index = string_step(self._source, old, n)
+        return self._index - old
+
+    def scan_while(self, predicate: Callable[[int], bool]) -> int:
+        "Advances past code points that satisfy predicate; returns how many."
+        source = self._source
+        start = i = self._index
+        end = len(source)
+        while i < end and predicate(ord(source[i])):
+            i += 1
+        self._index = i
+        return i - start
+
+    def scan_over(self, code_points: Union[str, Iterable[int]]) -> int:
+        "Advances past any of the given code points; returns how many."
+        start = self._index
+        run = _code_point_run(_code_point_chars(code_points))
+        self._index = cast(re.Match[str], run.match(self._source, start)).end()
+        return self._index - start
+
+    def find_any(self, code_points: Union[str, Iterable[int]]) -> bool:
+        """
+        Advances to the next of the given code points, or to the end if there
+        is none; returns whether one was found.
+        """
+        chars = _code_point_chars(code_points)
+        source = self._source
+        if len(chars) == 1:
+            found = source.find(chars, self._index)
+        else:
+            match = _code_point_class(chars).search(source, self._index)
+            found = -1 if match is None else match.start()
+        if found < 0:
+            self._index = len(source)
+            return False
+        self._index = found
+        return True
+
+    def find(self, needle: str) -> bool:
+        "Like find_any, but for a whole substring."
+        found = self._source.find(needle, self._index)
+        if found < 0:
+            self._index = len(self._source)
+            return False
+        self._index = found
+        return True
+
+    def substring_to(self, end: "StringCursor") -> str:
+        "The text from this cursor up to end, which must share its source."
+        if end._source is not self._source and end._source != self._source:
+            raise ValueError("cursors over different strings")
+        return self._source[self._index : end._index]
+
+    def __repr__(self) -> str:
+        return f"StringCursor({self._source!r}, {self._index})"
+
+
 def string_from_code_point(code_point: int) -> str:
     if code_point >= 0xD800 and code_point <= 0xDFFF:
         raise ValueError(f"invalid Unicode scalar value {code_point:X}")
@@ -726,16 +1247,174 @@ def require_no_string_index(i: int) -> int:
     raise AssertionError(f"require_string_index; {i!r} not < 0 ")
 
 
-utf32_type_code: str = ""
+# Rely on at least one of these to be 4 bytes.
+utf32_type_code: str = next((_ for _ in ["I", "L"] if array(_, []).itemsize == 4))
+
+# Arrays use native byte order. The codec rejects surrogates and values past
+# U+10FFFF, and decodes straight from the array's buffer with no bytes copy.
+_utf32_decode = (
+    codecs.utf_32_le_decode if sys.byteorder == "little" else codecs.utf_32_be_decode
+)
+_utf32_encoding = "utf-32-le" if sys.byteorder == "little" else "utf-32-be"
 
 
 def string_from_code_points(code_points: Iterable[int]) -> str:
-    global utf32_type_code
-    # Find system needs if not yet initialized.
-    if utf32_type_code == "":
-        # Rely on at least one of these to be 4 bytes.
-        utf32_type_code = next((_ for _ in ["I", "L"] if array(_, []).itemsize == 4))
-    return array(utf32_type_code, code_points).tobytes().decode("utf-32")
+    return _utf32_decode(array(utf32_type_code, code_points), "strict", True)[0]
+
+
+class CodePointStringBuilder:
+    """
+    Accumulates code points, and whole strings, into a flat UTF-32 buffer
+    and decodes it once at the end, without any intermediate list.
+    """
+
+    __slots__ = ("_buffer",)
+
+    _buffer: "array[int]"
+
+    def __init__(self) -> None:
+        self._buffer = array(utf32_type_code)
+
+    def append(self, code_point: int) -> None:
+        # Reject eagerly so the error points at the bad append.
+        if 0xD800 <= code_point <= 0xDFFF or not 0 <= code_point <= 0x10FFFF:
+            raise ValueError(f"invalid Unicode scalar value {code_point:X}")
+        self._buffer.append(code_point)
+
+    def extend(self, code_points: Iterable[int]) -> None:
+        "Appends many code points; they are validated by to_string."
+        self._buffer.extend(code_points)
+
+    def append_string(self, s: str) -> None:
+        self._buffer.frombytes(s.encode(_utf32_encoding))
+
+    def __len__(self) -> int:
+        "The count of code points appended so far."
+        return len(self._buffer)
+
+    def clear(self) -> None:
+        del self._buffer[:]
+
+    def to_string(self) -> str:
+        return _utf32_decode(self._buffer, "strict", True)[0]
+
+
+class StringOffsetIndex:
+    """
+    Maps between code point indices, as Python uses, and the UTF-8 and
+    UTF-16 offsets that other backends and protocols use.
+
+    Stores the UTF-8 and UTF-16 offsets of every stride-th code point, so
+    each query encodes at most one stride of text. ASCII strings need no
+    table at all.
+    """
+
+    __slots__ = ("_source", "_utf8", "_utf16")
+
+    stride: ClassVar[int] = 64
+
+    _source: str
+    # Empty for ASCII strings, where all three kinds of offsets agree.
+    _utf8: "array[int]"
+    _utf16: "array[int]"
+
+    def __init__(self, source: str) -> None:
+        self._source = source
+        self._utf8 = array("q")
+        self._utf16 = array("q")
+        if not source.isascii():
+            stride = self.stride
+            utf8 = utf16 = 0
+            for start in range(0, len(source), stride):
+                self._utf8.append(utf8)
+                self._utf16.append(utf16)
+                chunk = source[start : start + stride]
+                utf8 += len(chunk.encode("utf-8", "surrogatepass"))
+                utf16 += len(chunk.encode("utf-16-le", "surrogatepass")) >> 1
+            self._utf8.append(utf8)
+            self._utf16.append(utf16)
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    def utf8_offset(self, index: int) -> int:
+        "The UTF-8 offset of the code point at index, clamped to the string."
+        source = self._source
+        index = max(0, min(index, len(source)))
+        if not self._utf8:
+            return index
+        chunk, rem = divmod(index, self.stride)
+        start = index - rem
+        return self._utf8[chunk] + len(
+            source[start:index].encode("utf-8", "surrogatepass")
+        )
+
+    def utf16_offset(self, index: int) -> int:
+        "The UTF-16 offset of the code point at index, clamped to the string."
+        source = self._source
+        index = max(0, min(index, len(source)))
+        if not self._utf16:
+            return index
+        chunk, rem = divmod(index, self.stride)
+        start = index - rem
+        return self._utf16[chunk] + (
+            len(source[start:index].encode("utf-16-le", "surrogatepass")) >> 1
+        )
+
+    def index_of_utf8(self, offset: int) -> int:
+        "The index of the code point whose UTF-8 encoding contains offset."
+        return self._index_of(offset, self._utf8, "utf-8", 1)
+
+    def index_of_utf16(self, offset: int) -> int:
+        "The index of the code point whose UTF-16 encoding contains offset."
+        return self._index_of(offset, self._utf16, "utf-16-le", 2)
+
+    def _index_of(
+        self, offset: int, table: "array[int]", encoding: str, unit: int
+    ) -> int:
+        source = self._source
+        if not table:
+            return max(0, min(offset, len(source)))
+        offset = max(0, min(offset, table[-1]))
+        chunk = bisect_right(table, offset) - 1
+        start = chunk * self.stride
+        if start >= len(source):
+            return len(source)
+        encoded = source[start : start + self.stride].encode(encoding, "surrogatepass")
+        # Ignoring errors drops any partly covered code point at the end.
+        prefix = encoded[: (offset - table[chunk]) * unit].decode(encoding, "ignore")
+        return start + len(prefix)
+
+
+_string_offset_indices: "OrderedDict[int, StringOffsetIndex]" = OrderedDict()
+_string_offset_indices_lock = threading.Lock()
+_string_offset_indices_max = 16
+
+
+def string_offset_index(s: str) -> StringOffsetIndex:
+    """
+    Gets a StringOffsetIndex for s, reusing a recently built one.
+    Recently used indices are cached by string identity.
+    """
+    if len(s) < StringOffsetIndex.stride:
+        # Cheaper to rebuild than to displace a large string from the cache.
+        return StringOffsetIndex(s)
+    key = id(s)
+    with _string_offset_indices_lock:
+        found = _string_offset_indices.get(key)
+        # The cached index keeps its string alive, so a matching id means
+        # the same string.
+        if found is not None and found._source is s:
+            _string_offset_indices.move_to_end(key)
+            return found
+    index = StringOffsetIndex(s)
+    with _string_offset_indices_lock:
+        _string_offset_indices[key] = index
+        _string_offset_indices.move_to_end(key)
+        while len(_string_offset_indices) > _string_offset_indices_max:
+            _string_offset_indices.popitem(last=False)
+    return index
 
 
 def string_split(string: str, separator: str) -> Sequence[str]:
@@ -781,7 +1460,7 @@ def string_to_int64(string: str, radix: Optional[int] = None) -> float:
 
 def list_filter(lst: Sequence[T], predicate: Callable[[T], bool]) -> Sequence[T]:
     "Filter a list of elements, aborting on no-result."
-    return tuple(i for i in lst if predicate(i))
+    return tuple(filter(predicate, lst))
 
 
 def list_for_each(lst: Sequence[T], action: Callable[[T], None]) -> None:
@@ -841,7 +1520,7 @@ def list_join(lst: Sequence[T], separator: str, stringifier: Callable[[T], str])
 
 def list_map(lst: Sequence[T], func: Callable[[T], U]) -> Sequence[U]:
     "Map a list of elements."
-    return tuple(func(i) for i in lst)
+    return tuple(map(func, lst))
 
 
 _lbrT = TypeVar("_lbrT")
@@ -886,13 +1565,98 @@ def list_builder_set(lst: MutableSequence[_lbsT], idx: int, val: _lbsT) -> None:
     lst[idx] = val
 
 
+# A sort key and whether to reverse, where a None key means natural order.
+_SortKey = Tuple[Optional[Callable[[Any], Any]], bool]
+# Comparators with a known equivalent sort key.
+_sort_keys: "WeakKeyDictionary[Callable[..., int], _SortKey]" = WeakKeyDictionary()
+
+
+def _float_sort_key(value: float) -> Tuple[Any, ...]:
+    # Matches float_cmp, sorting nan after everything else, and -0.0 before 0.0.
+    if value != value:
+        return (1,)
+    return (0, value, copysign(1.0, value))
+
+
+def _register_sort_key(
+    compare: Callable[..., int], key: Optional[Callable[[Any], Any]], reverse: bool
+) -> None:
+    try:
+        _sort_keys[compare] = (key, reverse)
+    except TypeError:
+        # Some builtin callables don't support weak references.
+        pass
+
+
+def comparator_by_key(
+    key: Callable[[T], Any], reverse: bool = False
+) -> Callable[[T, T], int]:
+    """
+    Makes a comparator that orders by key(element), which listed_sorted and
+    list_builder_sort can replace with a native sort key.
+    """
+    sign = -1 if reverse else 1
+
+    def compare(left: T, right: T) -> int:
+        a = key(left)
+        b = key(right)
+        return sign * ((a > b) - (a < b))
+
+    _register_sort_key(compare, key, reverse)
+    return compare
+
+
+def reversed_comparator(compare: Callable[[T, T], int]) -> Callable[[T, T], int]:
+    "Makes a comparator that orders in the opposite direction from compare."
+
+    def reversed_compare(left: T, right: T) -> int:
+        return compare(right, left)
+
+    known = _sort_key_lookup(compare)
+    if known is not None:
+        _register_sort_key(reversed_compare, known[0], not known[1])
+    return reversed_compare
+
+
+def _sort_key_lookup(
+    compare: Callable[..., int],
+) -> Optional[_SortKey]:
+    try:
+        return _sort_keys.get(compare)
+    except TypeError:
+        return None
+
+
+def _native_sort_key(
+    lst: Sequence[T], compare: Callable[[T, T], int]
+) -> Optional[_SortKey]:
+    "Finds a native (key, reverse) equivalent to compare over lst, if any."
+    if compare is generic_cmp or compare is _speedups.generic_cmp:
+        # Only floats need special keys, and mixed lists need generic_cmp itself.
+        floats = sum(1 for e in lst if isinstance(e, float))
+        if floats == 0:
+            return (None, False)
+        elif floats == len(lst):
+            return (_float_sort_key, False)
+        return None
+    return _sort_key_lookup(compare)
+
+
+_register_sort_key(float_cmp, _float_sort_key, False)
+_register_sort_key(_speedups.float_cmp, _float_sort_key, False)
+_register_sort_key(_ordered_cmp, None, False)
+
 _lbsoT = TypeVar("_lbsoT")
 
 
 def list_builder_sort(
     lst: List[_lbsoT], compare: Callable[[_lbsoT, _lbsoT], int]
 ) -> None:
-    return lst.sort(key=cmp_to_key(compare))
+    native = _native_sort_key(lst, compare)
+    if native is None:
+        lst.sort(key=cmp_to_key(compare))
+    else:
+        lst.sort(key=native[0], reverse=native[1])
 
 
 _lbmdT = TypeVar("_lbmdT")
@@ -912,6 +1676,81 @@ def list_map_dropping(
     return tuple(results)
 
 
+_lvT = TypeVar("_lvT")
+
+
+class ListView(Sequence[_lvT]):
+    """
+    A read-only window onto a range of an immutable sequence.
+
+    Slicing a tuple copies its elements, so list_slice hands out views of
+    tuples instead. A view keeps its whole source alive, so short slices are
+    still copied; see _list_view_min_len.
+    """
+
+    __slots__ = ("_source", "_start", "_stop")
+
+    _source: Sequence[_lvT]
+    _start: int
+    _stop: int
+
+    def __init__(self, source: Sequence[_lvT], start: int, stop: int) -> None:
+        if isinstance(source, ListView):
+            # View the underlying sequence so that views of views stay cheap.
+            start += source._start
+            stop += source._start
+            source = source._source
+        self._source = source
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> _lvT: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[_lvT]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[_lvT, Sequence[_lvT]]:
+        length = self._stop - self._start
+        if isinstance(index, slice):
+            start, stop, step = index.indices(length)
+            if step != 1:
+                return tuple(self)[index]
+            return ListView(self, start, max(start, stop))
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("ListView index out of range")
+        return self._source[self._start + index]
+
+    def __iter__(self) -> Iterator[_lvT]:
+        return map(self._source.__getitem__, range(self._start, self._stop))
+
+    def __reversed__(self) -> Iterator[_lvT]:
+        return map(self._source.__getitem__, range(self._stop - 1, self._start - 1, -1))
+
+    def __eq__(self, other: object) -> bool:
+        # Compare like the tuple that list_slice used to return.
+        if not isinstance(other, (tuple, ListView)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return all(a is b or a == b for a, b in zip(self, other))
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        return repr(tuple(self))
+
+
+# Below this length, copying a slice is about as cheap as making a view, and
+# the copy does not keep the rest of the source alive.
+_list_view_min_len = 32
+
 _lbslT = TypeVar("_lbslT")
 
 
@@ -919,8 +1758,12 @@ def list_slice(
     lst: Sequence[_lbslT], start_inclusive: int, end_exclusive: int
 ) -> Sequence[_lbslT]:
     "Almost exactly a Python slice, but indices are constrained to be >= 0."
-    # TODO(tjp): Cheaper to always say tuple here, or separate out for ListBuilder use?
-    return tuple(lst[max(start_inclusive, 0) : max(end_exclusive, 0)])
+    start = max(start_inclusive, 0)
+    stop = min(max(end_exclusive, start), len(lst))
+    if stop - start >= _list_view_min_len and isinstance(lst, (tuple, ListView)):
+        # Immutable, so share rather than copy.
+        return ListView(lst, start, stop)
+    return tuple(lst[start:stop])
 
 
 _lrT = TypeVar("_lrT")
@@ -943,16 +1786,104 @@ def listed_reduce_from(
 
 
 def listed_sorted(lst: Sequence[T], compare: Callable[[T, T], int]) -> Sequence[T]:
-    return tuple(sorted(lst, key=cmp_to_key(compare)))
+    native = _native_sort_key(lst, compare)
+    if native is None:
+        return tuple(sorted(lst, key=cmp_to_key(compare)))
+    key, reverse = native
+    # The native keys and comparisons work on values that the static types
+    # only know as T, so sort them as Any.
+    if key is None:
+        return tuple(sorted(cast(Sequence[Any], lst), reverse=reverse))
+    return tuple(sorted(lst, key=key, reverse=reverse))
 
 
 def listed_to_list(lst: Sequence[T]) -> Sequence[T]:
-    if isinstance(lst, tuple):
+    if isinstance(lst, (tuple, ListView)):
         return lst
     else:
         return tuple(lst)
 
 
+_llT = TypeVar("_llT")
+_llU = TypeVar("_llU")
+
+
+def _map_dropping_iter(
+    func: Callable[[Any], Any], source: Iterable[Any]
+) -> Iterator[Any]:
+    for entry in source:
+        try:
+            value = func(entry)
+        except Exception:
+            continue
+        yield value
+
+
+class LazyListed(Generic[_llT]):
+    """
+    A chain of listed operations fused into a single pass over a source.
+
+    map, filter and map_dropping only record a step. Terminal operations
+    like reduce and to_list stream each element through every step, so no
+    intermediate tuples are built.
+    """
+
+    __slots__ = ("_source", "_steps")
+
+    _source: Iterable[Any]
+    _steps: Tuple[Tuple[Callable[..., Iterator[Any]], Callable[[Any], Any]], ...]
+
+    def __init__(self, source: Iterable[_llT]) -> None:
+        self._source = source
+        self._steps = ()
+
+    def _then(
+        self, step: Callable[..., Iterator[Any]], func: Callable[[Any], Any]
+    ) -> "LazyListed[Any]":
+        result: LazyListed[Any] = LazyListed(self._source)
+        result._steps = self._steps + ((step, func),)
+        return result
+
+    def __iter__(self) -> Iterator[_llT]:
+        # Steps are applied afresh each time, so a pipeline can be reused.
+        it: Iterator[Any] = iter(self._source)
+        for step, func in self._steps:
+            it = step(func, it)
+        return it
+
+    def map(self, func: Callable[[_llT], _llU]) -> "LazyListed[_llU]":
+        return self._then(map, func)
+
+    def filter(self, predicate: Callable[[_llT], bool]) -> "LazyListed[_llT]":
+        return self._then(filter, predicate)
+
+    def map_dropping(
+        self, func: Callable[[_llT], Union[_llU, NoReturn]]
+    ) -> "LazyListed[_llU]":
+        return self._then(_map_dropping_iter, func)
+
+    def reduce(self, accumulate: Callable[[_llT, _llT], _llT]) -> _llT:
+        return reduce(accumulate, self)
+
+    def reduce_from(
+        self, initial: _llU, accumulate: Callable[[_llU, _llT], _llU]
+    ) -> _llU:
+        return reduce(accumulate, self, initial)
+
+    def join(self, separator: str, stringifier: Callable[[_llT], str]) -> str:
+        return separator.join(map(stringifier, self))
+
+    def for_each(self, action: Callable[[_llT], None]) -> None:
+        for el in self:
+            action(el)
+
+    def to_list(self) -> Sequence[_llT]:
+        "Materialize the pipeline, as when the result is stored or escapes."
+        if not self._steps:
+            return listed_to_list(cast(Sequence[_llT], self._source))
+        return tuple(self)
+
+
 def deque_remove_first(deq: Deque[T]) -> T:
     "Defer to deque.popleft, except bubbling when the deque is empty."
     return deq.popleft()
@@ -1050,29 +1981,156 @@ def mapped_for_each(
 
 
 # Async support
-# The executor used for Temper async{...} calls.
-_executor = ThreadPoolExecutor()
-# This lock guards _unresolved_count
-_unresolved_count_lock = threading.Lock()
-_unresolved_count = 0
-# Signal this whenever _unresolved_count drops to 0
+# The executor used for Temper async{...} calls.  Created on first use by
+# _get_executor unless configure_async supplies one.
+_executor: Optional[Executor] = None
+# Whether we created _executor, and so may shut it down.
+_executor_owned = False
+_executor_lock = threading.Lock()
+# Worker count for the pool that _get_executor creates.
+# None means ThreadPoolExecutor's default.
+_executor_max_workers: Optional[int] = (
+    int(os.environ["TEMPER_CORE_ASYNC_MAX_WORKERS"])
+    if os.environ.get("TEMPER_CORE_ASYNC_MAX_WORKERS")
+    else None
+)
+
+
+def configure_async(
+    executor: Optional[Executor] = None,
+    max_workers: Optional[int] = None,
+) -> None:
+    """
+    Choose where Temper async{...} calls run.
+
+    Pass an executor to share one that the application manages;
+    await_safe_to_exit leaves it running.  Otherwise, max_workers sizes the
+    thread pool that is created on first use, overriding the
+    TEMPER_CORE_ASYNC_MAX_WORKERS environment variable.
+
+    Coroutines are generators closed over their callers' state, so they
+    cannot be stepped in another process, and process pools are rejected.
+    """
+    global _executor, _executor_owned, _executor_max_workers
+    if isinstance(executor, ProcessPoolExecutor):
+        raise TypeError("Temper coroutines cannot be stepped in a process pool")
+    if executor is not None and max_workers is not None:
+        raise ValueError("pass executor or max_workers, not both")
+    with _executor_lock:
+        old, old_owned = _executor, _executor_owned
+        _executor, _executor_owned = executor, False
+        if max_workers is not None:
+            _executor_max_workers = max_workers
+    if old is not None and old_owned:
+        # Work already submitted still runs to completion.
+        old.shutdown(wait=False)
+
+
+def _get_executor() -> Executor:
+    global _executor, _executor_owned
+    executor = _executor
+    if executor is None:
+        with _executor_lock:
+            executor = _executor
+            if executor is None:
+                executor = _executor = ThreadPoolExecutor(
+                    max_workers=_executor_max_workers,
+                    thread_name_prefix="temper-async",
+                )
+                _executor_owned = True
+    return executor
+
+
+# Promises and launched coroutines that have not yet finished.
+# Adding to and discarding from a set are atomic, so this needs no lock.
+_unresolved: Set[object] = set()
+# Signal this whenever _unresolved becomes empty.  Only
+# await_safe_to_exit clears it, so creating promises does not touch it.
 _all_resolved = threading.Event()
 _all_resolved.set()
 
 
-def _increment_unresolved_count() -> None:
-    global _unresolved_count
-    with _unresolved_count_lock:
-        _unresolved_count += 1
-        _all_resolved.clear()
+def _resolve_unresolved(token: object) -> None:
+    _unresolved.discard(token)
+    if not _unresolved:
+        _all_resolved.set()
+
+
+# When set by use_asyncio, Temper async{...} calls run as tasks on this
+# loop instead of on _executor, and promises are asyncio futures.
+_asyncio_loop: Optional[asyncio.AbstractEventLoop] = None
+# Tasks and promises on _asyncio_loop that await_safe_to_exit waits for.
+_asyncio_pending: Set["asyncio.Future[Any]"] = set()
+
+
+def use_asyncio(
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> asyncio.AbstractEventLoop:
+    """
+    Run Temper async support on an asyncio event loop instead of a thread
+    pool.  With no loop given, this uses the running loop if there is one,
+    so that generated code can run inside an existing asyncio application,
+    or else a new loop that await_safe_to_exit drives.
+
+    Call this before creating any promises.  Temper code should then run on
+    the loop's thread; promises may still be resolved from other threads.
+    use_threads switches back.
+    """
+    global _asyncio_loop
+    if loop is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = asyncio.new_event_loop()
+    _asyncio_loop = loop
+    return loop
+
+
+def use_threads() -> None:
+    """
+    Undo use_asyncio, so that Temper async{...} calls run on the executor
+    again and new promises are concurrent.futures ones.
+
+    Coroutines already launched on the loop are first run to completion,
+    unless the loop is running, in which case they are left to its owner.
+    """
+    global _asyncio_loop
+    loop = _asyncio_loop
+    if loop is None:
+        return
+    if not loop.is_running() and not loop.is_closed():
+        loop.run_until_complete(_drain_asyncio_tasks())
+    _asyncio_loop = None
+    _asyncio_pending.clear()
+
+
+def _on_asyncio_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    """Whether this thread may touch the loop's futures directly."""
+    if not loop.is_running():
+        return True
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _track_asyncio(fut: "asyncio.Future[Any]") -> None:
+    _asyncio_pending.add(fut)
+    fut.add_done_callback(_asyncio_pending.discard)
 
 
-def _decrement_unresolved_count() -> None:
-    global _unresolved_count
-    with _unresolved_count_lock:
-        _unresolved_count -= 1
-        if _unresolved_count <= 0:
-            _all_resolved.set()
+async def _drain_asyncio() -> None:
+    while _asyncio_pending:
+        await asyncio.wait(set(_asyncio_pending))
+
+
+async def _drain_asyncio_tasks() -> None:
+    "Like _drain_asyncio, but does not wait for promises nothing awaits."
+    while True:
+        tasks = [fut for fut in _asyncio_pending if isinstance(fut, asyncio.Task)]
+        if not tasks:
+            return
+        await asyncio.wait(tasks)
 
 
 _nbuT = TypeVar("_nbuT")
@@ -1080,12 +2138,16 @@ _nbuT = TypeVar("_nbuT")
 
 # Support for Temper `new PromiseBuilder()`.
 def new_unbound_promise() -> Future[_nbuT]:  # FTS [T] -> Future[T]
-    global _unresolved_count
-    with _unresolved_count_lock:
-        _unresolved_count += 1
-        _all_resolved.clear()
+    loop = _asyncio_loop
+    if loop is not None:
+        fut: "asyncio.Future[_nbuT]" = loop.create_future()
+        _track_asyncio(fut)
+        # Generated code only hands promises back to this module, so the
+        # static type does not need to distinguish the two kinds of future.
+        return cast(Future[_nbuT], fut)
     p: Future[_nbuT] = Future()  # FTS [T]
-    p.add_done_callback(lambda _: _decrement_unresolved_count())
+    _unresolved.add(p)
+    p.add_done_callback(_resolve_unresolved)
     return p
 
 
@@ -1122,41 +2184,95 @@ def _step_async_coro(
       resolution (either a result or an exception) and start it running
     """
     yielded: Optional[Exception] = None
-    # The caller must have incremented the unresolved count.
-    # This try/finally takes care to decrement or hand responsibility
-    # to decrement to another call of the same function.
+    # The caller must have added the generator to _unresolved.
+    # This try/finally takes care to resolve it or hand responsibility
+    # for that to another call of the same function.
     try:
-        result: Optional[_sacT] = None
-        exc = None
-
-        if p is not None:
-            exc = p.exception()
-            if exc is None:
-                result = p.result()
-        try:
-            if exc is not None:
-                yielded = generator.throw(exc)
-            else:
-                yielded = generator.send(cast(_sacT, result))
-        except StopIteration:
-            pass
-        except Exception as e:
-            print_exception(type(e), value=e, tb=e.__traceback__)
-            raise e
+        while True:
+            result: Optional[_sacT] = None
+            exc: Optional[Exception] = None
+
+            if p is not None:
+                # One call to result() rather than also calling exception(),
+                # since each takes the future's lock.
+                try:
+                    result = p.result()
+                except Exception as e:
+                    exc = e
+            yielded = None
+            try:
+                if exc is not None:
+                    yielded = generator.throw(exc)
+                else:
+                    yielded = generator.send(cast(_sacT, result))
+            except StopIteration:
+                break
+            except Exception as e:
+                print_exception(type(e), value=e, tb=e.__traceback__)
+                raise e
+            # While the awaited promise is already resolved, keep stepping
+            # here instead of going through add_done_callback, which would
+            # call straight back into this function and grow the stack.
+            if not isinstance(yielded, _Awaiting) or not yielded.future.done():
+                break
+            p = yielded.future
     finally:
         # If we stopped at another await call, register for another turn.
         if isinstance(yielded, _Awaiting):
             future = yielded.future
 
-            # The next step call takes responsibility for decrementing the unresolved count. # noqa: E501
+            # The next step call takes responsibility for resolving the generator. # noqa: E501
             def done_callback(p: Optional[Future[_sacT]]) -> None:
                 _step_async_coro(generator, p)
 
             future.add_done_callback(done_callback)
         else:
-            # There is no following step call responsible for decrementing
-            # the count
-            _decrement_unresolved_count()
+            # There is no following step call responsible for resolving
+            # the generator
+            _resolve_unresolved(generator)
+
+
+async def _drive_asyncio_coro(generator: Generator[None, Any, None]) -> None:
+    """
+    The asyncio counterpart to _step_async_coro: steps the generator,
+    natively awaiting each promise that it yields via its `do_await`.
+    """
+    result: Any = None
+    exc: Optional[BaseException] = None
+    while True:
+        try:
+            if exc is not None:
+                yielded: Any = generator.throw(exc)
+            else:
+                yielded = generator.send(result)
+        except StopIteration:
+            return
+        except Exception as e:
+            # Nothing awaits a launched coroutine, so report the failure
+            # the way the loop reports other unhandled errors.
+            asyncio.get_running_loop().call_exception_handler(
+                {
+                    "message": "Temper coroutine failed",
+                    "exception": e,
+                    "task": asyncio.current_task(),
+                }
+            )
+            return
+        result, exc = None, None
+        if isinstance(yielded, _Awaiting):
+            future = yielded.future
+            try:
+                if isinstance(future, Future) and future.done():
+                    # Wrapping would cost a trip around the loop.
+                    result = future.result()
+                else:
+                    # Passes asyncio futures through and adapts
+                    # concurrent.futures ones.
+                    result = await asyncio.wrap_future(cast(Any, future))
+            except (Exception, asyncio.CancelledError) as e:
+                exc = e
+        else:
+            await asyncio.sleep(0)
 
 
 _agfT = TypeVar("_agfT")
@@ -1198,17 +2314,50 @@ def async_launch(generator_factory: Callable[[], Generator[None, T, None]]) -> N
     promise resolution when it yields via its `do_await`.
     """
     generator = generator_factory()
-    # No this increment will be undone by _step_async_coro
-    _increment_unresolved_count()
-    _executor.submit(_step_async_coro, generator, None)
+    loop = _asyncio_loop
+    if loop is not None:
+        coro = _drive_asyncio_coro(generator)
+        if _on_asyncio_loop(loop):
+            _track_asyncio(loop.create_task(coro))
+        else:
+            launch_loop = loop
+
+            def launch() -> None:
+                _track_asyncio(launch_loop.create_task(coro))
+
+            loop.call_soon_threadsafe(launch)
+        return
+    # _step_async_coro resolves this when the generator finishes
+    _unresolved.add(generator)
+    _get_executor().submit(_step_async_coro, generator, None)
 
 
 def await_safe_to_exit() -> None:
     """
     Called by generated main methods to allow async tasks to complete.
+
+    When using asyncio, this runs the loop until launched tasks and created
+    promises are done, unless the loop is already running, in which case
+    its owner decides when to stop.
     """
-    _all_resolved.wait()
-    _executor.shutdown()
+    global _executor
+    loop = _asyncio_loop
+    if loop is not None and not loop.is_running():
+        loop.run_until_complete(_drain_asyncio())
+    # Clear before checking so that a resolution between the check and the
+    # wait still wakes us.
+    while True:
+        _all_resolved.clear()
+        if not _unresolved:
+            break
+        _all_resolved.wait()
+    # Only shut down a pool we created.  A later launch makes a new one.
+    with _executor_lock:
+        executor, owned = _executor, _executor_owned
+        if owned:
+            _executor = None
+    if executor is not None and owned:
+        executor.shutdown()
 
 
 def complete_promise(p: Future[T], resolution: T) -> None:
@@ -1216,6 +2365,9 @@ def complete_promise(p: Future[T], resolution: T) -> None:
     Resolves the promise with the given value, but, like Temper
     PromiseBuilder, second and subsequent resolutions are no-ops.
     """
+    if isinstance(p, asyncio.Future):
+        _settle_asyncio(p, p.set_result, resolution)
+        return
     try:
         p.set_result(resolution)
         # The illegal state exception is not public in concurrent.futures.
@@ -1229,7 +2381,11 @@ def break_promise(p: Future[T], exc: Union[BaseException, None] = None) -> None:
     PromiseBuilder, second and subsequent resolutions are no-ops.
     """
     if exc is None:
-        exc = make_bubble_exception()
+        # The promise keeps its exception, so do not share one.
+        exc = RuntimeError()
+    if isinstance(p, asyncio.Future):
+        _settle_asyncio(p, p.set_exception, exc)
+        return
     try:
         p.set_exception(exc)
         # The illegal state exception is not public in concurrent.futures.
@@ -1237,61 +2393,509 @@ def break_promise(p: Future[T], exc: Union[BaseException, None] = None) -> None:
         pass
 
 
+def _settle_asyncio(
+    p: "asyncio.Future[Any]", settle: Callable[[Any], None], value: Any
+) -> None:
+    # asyncio futures are not thread-safe, so resolve them on their loop.
+    def settle_once() -> None:
+        if not p.done():
+            settle(value)
+
+    loop = p.get_loop()
+    if _on_asyncio_loop(loop):
+        settle_once()
+    else:
+        loop.call_soon_threadsafe(settle_once)
+
+
+def cancel_promise(p: Future[T]) -> None:
+    """
+    Resolves the promise as cancelled, so coroutines awaiting it see a
+    cancellation error.  Like break_promise, this is a no-op on a promise
+    that is already resolved.
+    """
+    if isinstance(p, asyncio.Future):
+        loop_future = p
+
+        def cancel(_: Any) -> None:
+            loop_future.cancel()
+
+        _settle_asyncio(p, cancel, None)
+        return
+    p.cancel()
+
+
+def _promise_failure(p: Future[Any]) -> Optional[BaseException]:
+    "The exception a resolved promise broke with, if any."
+    try:
+        return p.exception()
+    except (CancelledError, asyncio.CancelledError) as e:
+        return e
+
+
+def _settle_like(target: Future[Any], source: Future[Any]) -> None:
+    "Resolves target the way source, which has resolved, did."
+    failure = _promise_failure(source)
+    if failure is None:
+        complete_promise(target, source.result())
+    elif isinstance(failure, (CancelledError, asyncio.CancelledError)):
+        cancel_promise(target)
+    else:
+        break_promise(target, failure)
+
+
+def _cancel_with(combined: Future[Any], promises: Sequence[Future[Any]]) -> None:
+    "Cancelling combined cancels any of promises that are still unresolved."
+
+    def on_done(c: Future[Any]) -> None:
+        if c.cancelled():
+            for p in promises:
+                cancel_promise(p)
+
+    combined.add_done_callback(on_done)
+
+
+def promise_all(promises: Iterable[Future[T]]) -> Future[Sequence[T]]:
+    """
+    A promise for the results of all the given promises, in order.  It
+    breaks as soon as any of them breaks.
+    """
+    pending = tuple(promises)
+    combined: Future[Sequence[T]] = new_unbound_promise()
+    if not pending:
+        complete_promise(combined, ())
+        return combined
+    # next() on a count is atomic, so callbacks on different threads agree
+    # on which one saw the last promise complete.
+    completed = itertools.count(1)
+
+    def on_done(p: Future[T]) -> None:
+        if _promise_failure(p) is not None:
+            _settle_like(combined, p)
+        elif next(completed) == len(pending):
+            complete_promise(combined, tuple(q.result() for q in pending))
+
+    _cancel_with(combined, pending)
+    for p in pending:
+        p.add_done_callback(on_done)
+    return combined
+
+
+def promise_race(promises: Iterable[Future[T]]) -> Future[T]:
+    "A promise that resolves the way the first of the given promises does."
+    pending = tuple(promises)
+    if not pending:
+        raise ValueError("no promises to race")
+    combined: Future[T] = new_unbound_promise()
+
+    def on_done(p: Future[T]) -> None:
+        _settle_like(combined, p)
+
+    _cancel_with(combined, pending)
+    for p in pending:
+        p.add_done_callback(on_done)
+    return combined
+
+
+def promise_any(promises: Iterable[Future[T]]) -> Future[T]:
+    """
+    A promise for the result of the first of the given promises to
+    complete.  It only breaks if they all do, and then like the last one.
+    """
+    pending = tuple(promises)
+    if not pending:
+        raise ValueError("no promises to wait for")
+    combined: Future[T] = new_unbound_promise()
+    failed = itertools.count(1)
+
+    def on_done(p: Future[T]) -> None:
+        if _promise_failure(p) is None or next(failed) == len(pending):
+            _settle_like(combined, p)
+
+    _cancel_with(combined, pending)
+    for p in pending:
+        p.add_done_callback(on_done)
+    return combined
+
+
+class _Timeout:
+    "A callback that the timeout thread runs once its deadline passes."
+
+    __slots__ = ("deadline", "sequence", "callback")
+
+    def __init__(
+        self, deadline: float, sequence: int, callback: Callable[[], None]
+    ) -> None:
+        self.deadline = deadline
+        # Breaks ties between equal deadlines, first scheduled first.
+        self.sequence = sequence
+        # None once run or cancelled.
+        self.callback: Optional[Callable[[], None]] = callback
+
+    def __lt__(self, other: "_Timeout") -> bool:
+        return (self.deadline, self.sequence) < (other.deadline, other.sequence)
+
+
+# Pending timeouts for promise_with_timeout in thread mode, as a heap with
+# the soonest deadline first.  One daemon thread, started on first use,
+# runs them, so timed promises in flight do not each need a thread.
+_timeouts: List[_Timeout] = []
+# Guards the timeout globals, and is notified when the soonest deadline
+# changes.
+_timeouts_changed = threading.Condition()
+# How many entries in _timeouts are cancelled but not yet popped.
+_timeouts_cancelled = 0
+_timeout_sequence = itertools.count()
+_timeout_thread: Optional[threading.Thread] = None
+
+
+def _schedule_timeout(seconds: float, callback: Callable[[], None]) -> _Timeout:
+    global _timeout_thread
+    timeout = _Timeout(time.monotonic() + seconds, next(_timeout_sequence), callback)
+    with _timeouts_changed:
+        heapq.heappush(_timeouts, timeout)
+        if _timeout_thread is None:
+            _timeout_thread = threading.Thread(
+                target=_run_timeouts, name="temper-timeouts", daemon=True
+            )
+            _timeout_thread.start()
+        elif _timeouts[0] is timeout:
+            _timeouts_changed.notify()
+    return timeout
+
+
+def _cancel_timeout(timeout: _Timeout) -> None:
+    global _timeouts_cancelled
+    with _timeouts_changed:
+        if timeout.callback is None:
+            return
+        timeout.callback = None
+        _timeouts_cancelled += 1
+        # Drop cancelled entries once they are most of the heap, so that
+        # long timeouts on promises that settle quickly do not pile up.
+        if _timeouts_cancelled * 2 > len(_timeouts):
+            _timeouts[:] = [t for t in _timeouts if t.callback is not None]
+            heapq.heapify(_timeouts)
+            _timeouts_cancelled = 0
+
+
+def _run_timeouts() -> None:
+    global _timeouts_cancelled
+    while True:
+        with _timeouts_changed:
+            while True:
+                if not _timeouts:
+                    _timeouts_changed.wait()
+                    continue
+                timeout = _timeouts[0]
+                if timeout.callback is None:
+                    heapq.heappop(_timeouts)
+                    _timeouts_cancelled -= 1
+                    continue
+                delay = timeout.deadline - time.monotonic()
+                if delay <= 0:
+                    heapq.heappop(_timeouts)
+                    callback = timeout.callback
+                    timeout.callback = None
+                    break
+                _timeouts_changed.wait(delay)
+        try:
+            callback()
+        except Exception as e:
+            # Keep running the other timeouts.
+            print_exception(type(e), value=e, tb=e.__traceback__)
+
+
+def promise_with_timeout(p: Future[T], seconds: float) -> Future[T]:
+    """
+    A promise that resolves the way p does, unless that takes longer than
+    the given number of seconds.  Then it breaks with a TimeoutError and p
+    is cancelled.
+    """
+    timed: Future[T] = new_unbound_promise()
+
+    def on_timeout() -> None:
+        if not timed.done():
+            break_promise(timed, TimeoutError())
+            cancel_promise(p)
+
+    cancel_timer: Callable[[], None]
+    if isinstance(timed, asyncio.Future):
+        cancel_timer = timed.get_loop().call_later(seconds, on_timeout).cancel
+    else:
+        cancel_timer = partial(_cancel_timeout, _schedule_timeout(seconds, on_timeout))
+
+    def on_done(t: Future[T]) -> None:
+        cancel_timer()
+
+    def on_source_done(source: Future[T]) -> None:
+        _settle_like(timed, source)
+
+    timed.add_done_callback(on_done)
+    _cancel_with(timed, (p,))
+    p.add_done_callback(on_source_done)
+    return timed
+
+
+class NetHeaders(Mapping[str, str]):
+    """
+    Response headers, looked up case-insensitively.  Repeated headers are
+    joined with commas.
+    """
+
+    __slots__ = ("_headers",)
+
+    def __init__(self, items: Iterable[Tuple[str, str]]) -> None:
+        headers: Dict[str, str] = {}
+        for name, value in items:
+            name = name.lower()
+            prior = headers.get(name)
+            headers[name] = value if prior is None else f"{prior}, {value}"
+        self._headers = headers
+
+    def __getitem__(self, name: str) -> str:
+        return self._headers[name.lower()]
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._headers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._headers)
+
+    def __len__(self) -> int:
+        return len(self._headers)
+
+    def __repr__(self) -> str:
+        return f"NetHeaders({self._headers!r})"
+
+
+def _charset_of(content_type: Optional[str]) -> str:
+    "The charset parameter of a content type, if Python knows it, or UTF-8."
+    if content_type is not None:
+        for param in content_type.split(";")[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "charset":
+                charset = value.strip().strip('"')
+                try:
+                    return codecs.lookup(charset).name
+                except LookupError:
+                    break
+    return "utf-8"
+
+
+class _BodyChunks(AsyncIterator[bytes]):
+    """
+    Iterates over a response body for NetResponse.chunks.  This is a class
+    rather than an async generator, which mypyc cannot compile.
+    """
+
+    def __init__(self, stream: _net.PooledResponse, size: int) -> None:
+        self._stream = stream
+        self._size = size
+        self._done = False
+
+    def __aiter__(self) -> "_BodyChunks":
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._done:
+            raise StopAsyncIteration
+        stream = self._stream
+        try:
+            chunk = await asyncio.get_running_loop().run_in_executor(
+                _get_executor(), stream.read1, self._size
+            )
+        except BaseException:
+            self._finish()
+            raise
+        if not chunk:
+            self._finish()
+            raise StopAsyncIteration
+        return chunk
+
+    def _finish(self) -> None:
+        self._done = True
+        self._stream.close()
+
+
 class NetResponse:
+    """
+    An HTTP response.  Its body can be had whole, via body or text, or
+    streamed in pieces via chunks, but not both.
+    """
+
     def __init__(
         self,
         status: int,
-        headers: Dict[str, str],
-        body: Future[str],
+        headers: Mapping[str, str],
+        stream: _net.PooledResponse,
     ):
         self.status = status
         self.headers = headers
-        self._body = body
+        self._stream = stream
+        # Guards _body, _text and _streaming.
+        self._lock = threading.Lock()
+        self._body: Optional[Future[bytes]] = None
+        self._text: Optional[Future[str]] = None
+        self._streaming = False
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self.headers.get("content-type")
+
+    @property
+    def charset(self) -> str:
+        "The charset from the content type, defaulting to UTF-8."
+        return _charset_of(self.content_type)
 
     @property
-    def content_type(self) -> str:
-        return self.headers["content-type"]
+    def body(self) -> Future[bytes]:
+        "The whole body.  Reading it starts the first time it is asked for."
+        body, claimed = self._claim_body()
+        if claimed:
+            _get_executor().submit(self._read_body, body)
+        return body
 
     @property
     def text(self) -> Future[str]:
-        return self._body
+        "The whole body, decoded using its charset."
+        with self._lock:
+            text = self._text
+            if text is not None:
+                return text
+            text = self._text = new_unbound_promise()
+        charset = self.charset
+
+        def decode(body: Future[bytes]) -> None:
+            failure = _promise_failure(body)
+            if failure is None:
+                # Like fetch, do not fail over malformed text.
+                complete_promise(text, body.result().decode(charset, "replace"))
+            else:
+                _settle_like(text, body)
+
+        self.body.add_done_callback(decode)
+        return text
+
+    def chunks(self, size: int = 1 << 16) -> AsyncIterator[bytes]:
+        """
+        Streams the body in pieces of at most size bytes, so that large
+        bodies need not fit in memory.  Reads run on the executor, so this
+        works on any event loop.  Call close() when stopping early.
+        """
+        with self._lock:
+            if self._body is not None or self._streaming:
+                raise RuntimeError("the response body has already been read")
+            self._streaming = True
+        return _BodyChunks(self._stream, size)
+
+    def close(self) -> None:
+        "Releases the connection without reading any more of the body."
+        self._stream.close()
+
+    def _claim_body(self) -> Tuple[Future[bytes], bool]:
+        "The body promise, and whether the caller must now read into it."
+        with self._lock:
+            body = self._body
+            if body is not None:
+                return body, False
+            if self._streaming:
+                raise RuntimeError("the response body is being streamed")
+            body = self._body = new_unbound_promise()
+            return body, True
+
+    def _read_body(self, body: Future[bytes]) -> None:
+        try:
+            with self._stream as stream:
+                complete_promise(body, stream.read())
+        except Exception as e:
+            break_promise(body, e)
 
 
 # Support for std/net
+# Keep-alive connections for std_net_send.  Created on first use by
+# _get_net_pool unless configure_net supplies settings.
+_net_pool: Optional[_net.ConnectionPool] = None
+_net_pool_lock = threading.Lock()
+_net_max_per_host = int(os.environ.get("TEMPER_CORE_NET_MAX_PER_HOST") or 10)
+
+
+def configure_net(
+    max_per_host: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> None:
+    """
+    Set how many connections std/net keeps open to each host, which also
+    bounds how many requests to a host run at once, and the socket timeout
+    in seconds.  The pool size defaults to the TEMPER_CORE_NET_MAX_PER_HOST
+    environment variable, or 10.
+    """
+    global _net_pool, _net_max_per_host
+    if max_per_host is None:
+        max_per_host = _net_max_per_host
+    pool = _net.ConnectionPool(max_per_host=max_per_host, timeout=timeout)
+    with _net_pool_lock:
+        old, _net_pool = _net_pool, pool
+        _net_max_per_host = max_per_host
+    if old is not None:
+        old.close()
+
+
+def _get_net_pool() -> _net.ConnectionPool:
+    global _net_pool
+    pool = _net_pool
+    if pool is None:
+        with _net_pool_lock:
+            pool = _net_pool
+            if pool is None:
+                pool = _net_pool = _net.ConnectionPool(_net_max_per_host)
+    return pool
+
+
 def std_net_send(
     url: str,
     method: str,
     body_content: Optional[str],
     body_mime_type: Optional[str],
+    stream: bool = False,
 ) -> Future[NetResponse]:
-    # TODO: use aiohttp for truly asynchronous fetching
-    # This is good enough for the infrequent client use case.
+    """
+    Sends an HTTP request for std/net.  The response is ready once its
+    body has been read, unless stream is true, in which case it is ready
+    once headers arrive, and the caller must read its body or close it to
+    free the connection.
+    """
+    # The blocking request runs on the executor, using pooled keep-alive
+    # connections.  The pool bounds how many run at once per host.
     data = None
     if body_content is not None:
         data = body_content.encode("utf-8")
     headers = {}
     if body_mime_type is not None:
         headers["content-type"] = body_mime_type
-    request = urllib.request.Request(url, data, headers, method=method)
     net_response_future: Future[NetResponse] = new_unbound_promise()
-    body_future: Future[str] = new_unbound_promise()
 
-    def do_fetch():
-        if False:
-            yield None  # Mark as a generator
-        with urllib.request.urlopen(request) as response:
-            try:
-                # TODO: use response headers to find body encoding.
-                body_future.set_result(response.read().decode("utf-8"))
-            except IOError as e:
-                body_future.set_exception(e)
-            net_response_future.set_result(
-                NetResponse(
-                    status=response.status, headers=response.headers, body=body_future
-                )
-            )
-
-    async_launch(lambda: do_fetch())
+    def do_fetch() -> None:
+        # Resolve via complete_promise and break_promise since, under
+        # use_asyncio, these are loop futures and this runs off the loop.
+        try:
+            response = _get_net_pool().request(method, url, data, headers)
+        except Exception as e:
+            break_promise(net_response_future, e)
+            return
+        net_response = NetResponse(
+            status=response.status,
+            headers=NetHeaders(response.headers.items()),
+            stream=response,
+        )
+        if not stream:
+            # Read here rather than on another executor task, and so that
+            # Temper code that never reads the body frees the connection.
+            body, _ = net_response._claim_body()
+            net_response._read_body(body)
+        complete_promise(net_response_future, net_response)
+
+    _get_executor().submit(do_fetch)
     return net_response_future
 
 
@@ -1351,3 +2955,12 @@ def _utf8_byte_of(code_point: int, byte_offset: int, n_bytes: int) -> int:
 
 def _utf16_size(char: str) -> int:
     return 1 + (ord(char) >= 0x10000)
+
+
+# Native helpers
+# Keep this last so that it replaces the definitions above.
+# Keep the replaced definitions around for benchmarking and debugging.
+_replaced_helpers: Dict[str, Callable[..., Any]] = {}
+if _speedups.COMPILED:
+    _replaced_helpers.update({name: globals()[name] for name in _speedups.__all__})
+    globals().update({name: getattr(_speedups, name) for name in _speedups.__all__})
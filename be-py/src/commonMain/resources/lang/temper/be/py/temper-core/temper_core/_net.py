@@ -0,0 +1,252 @@
+"""
+A keep-alive HTTP client for std/net.
+
+Connections are pooled per scheme, host and port so that repeated requests
+to one service reuse TCP connections and TLS sessions instead of
+handshaking every time.  A host has at most `max_per_host` connections, and
+requests beyond that wait for one to come back, which bounds concurrency.
+
+Requests that the environment routes through a proxy, and URLs that are
+not http or https, go through urllib as before.
+"""
+
+import http.client
+import socket
+import ssl
+import threading
+import urllib.error
+import urllib.request
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+__all__ = ["ConnectionPool", "PooledResponse"]
+
+_Key = Tuple[str, str, int]
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# Statuses followed like urllib does: 301 to 303 turn other methods into GET.
+_REDIRECTS = frozenset((301, 302, 303, 307, 308))
+_MAX_REDIRECTS = 10
+# What sending on a pooled connection raises if the server has since
+# closed it.
+_STALE_ERRORS = (ConnectionResetError, ConnectionAbortedError, BrokenPipeError)
+
+
+class PooledResponse:
+    """
+    An HTTP response whose connection returns to its pool when the response
+    is closed, if the body was read to the end and the server allows reuse.
+    """
+
+    __slots__ = ("_response", "_release")
+
+    def __init__(
+        self,
+        response: http.client.HTTPResponse,
+        release: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        self._response = response
+        self._release = release
+
+    @property
+    def status(self) -> int:
+        return self._response.status
+
+    @property
+    def headers(self) -> http.client.HTTPMessage:
+        return self._response.headers
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._response.read(amt)
+
+    def read1(self, amt: int = -1) -> bytes:
+        "Reads up to amt bytes with at most one read from the socket."
+        return self._response.read1(amt)
+
+    def close(self) -> None:
+        response = self._response
+        release, self._release = self._release, None
+        if release is None:
+            response.close()
+            return
+        reusable = response.isclosed() and not response.will_close
+        response.close()
+        release(reusable)
+
+    def __enter__(self) -> "PooledResponse":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    "Keep-alive HTTP/1.1 connections, pooled per scheme, host and port."
+
+    def __init__(self, max_per_host: int = 10, timeout: Optional[float] = None):
+        if max_per_host < 1:
+            raise ValueError("max_per_host must be positive")
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        # Guards _idle and _checked_out, and is notified when a connection
+        # is returned.
+        self._available = threading.Condition()
+        self._idle: Dict[_Key, List[http.client.HTTPConnection]] = {}
+        self._checked_out: Dict[_Key, int] = {}
+        # Set by close, after which returned connections are closed rather
+        # than kept idle.
+        self._closed = False
+        self._ssl_context: Optional[ssl.SSLContext] = None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> PooledResponse:
+        """
+        Sends a request, following redirects, and returns the response once
+        its headers arrive.  Close the response to release its connection.
+        Unlike urlopen, error statuses are responses rather than exceptions.
+        """
+        request_headers = dict(headers or {})
+        for _ in range(_MAX_REDIRECTS + 1):
+            response = self._send(method, url, body, request_headers)
+            location = response.headers.get("location")
+            if response.status not in _REDIRECTS or location is None:
+                return response
+            # Read the small redirect body so the connection can be reused.
+            response.read()
+            response.close()
+            url = urljoin(url, location)
+            if response.status != 307 and response.status != 308:
+                if method not in ("GET", "HEAD"):
+                    method, body = "GET", None
+                    request_headers = {
+                        name: value
+                        for name, value in request_headers.items()
+                        if name.lower() not in ("content-type", "content-length")
+                    }
+        raise http.client.HTTPException(f"too many redirects from {url}")
+
+    def close(self) -> None:
+        "Closes idle connections.  Checked out ones close when released."
+        with self._available:
+            self._closed = True
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        body: Optional[bytes],
+        headers: Dict[str, str],
+    ) -> PooledResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        host = parts.hostname
+        if scheme not in _DEFAULT_PORTS or host is None or _proxied(url):
+            return _send_with_urllib(method, url, body, headers)
+        key = (scheme, host, parts.port or _DEFAULT_PORTS[scheme])
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        conn, reused = self._check_out(key)
+        try:
+            try:
+                conn.request(method, target, body, headers)
+                response = conn.getresponse()
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                # The server closed the idle connection, so use a new one.
+                conn.close()
+                conn = self._connect(key)
+                conn.request(method, target, body, headers)
+                response = conn.getresponse()
+        except BaseException:
+            conn.close()
+            self._check_in(key, None)
+            raise
+
+        def release(reusable: bool) -> None:
+            if not reusable:
+                conn.close()
+            self._check_in(key, conn if reusable else None)
+
+        return PooledResponse(response, release)
+
+    def _check_out(self, key: _Key) -> Tuple[http.client.HTTPConnection, bool]:
+        "A connection and whether it has been used before."
+        with self._available:
+            while True:
+                checked_out = self._checked_out.get(key, 0)
+                idle = self._idle.get(key)
+                if idle:
+                    self._checked_out[key] = checked_out + 1
+                    # Most recently used first, as it is least likely to
+                    # have timed out on the server.
+                    return idle.pop(), True
+                if checked_out < self.max_per_host:
+                    self._checked_out[key] = checked_out + 1
+                    break
+                self._available.wait()
+        try:
+            return self._connect(key), False
+        except BaseException:
+            self._check_in(key, None)
+            raise
+
+    def _check_in(
+        self, key: _Key, conn: Optional[http.client.HTTPConnection]
+    ) -> None:
+        with self._available:
+            self._checked_out[key] -= 1
+            if conn is not None and not self._closed:
+                self._idle.setdefault(key, []).append(conn)
+                conn = None
+            self._available.notify()
+        if conn is not None:
+            conn.close()
+
+    def _connect(self, key: _Key) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        timeout = self.timeout
+        if timeout is None:
+            timeout = socket.getdefaulttimeout()
+        if scheme == "https":
+            context = self._ssl_context
+            if context is None:
+                context = self._ssl_context = ssl.create_default_context()
+            return http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=context
+            )
+        return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+def _proxied(url: str) -> bool:
+    parts = urlsplit(url)
+    proxies = urllib.request.getproxies()
+    return parts.scheme.lower() in proxies and not urllib.request.proxy_bypass(
+        parts.netloc
+    )
+
+
+def _send_with_urllib(
+    method: str,
+    url: str,
+    body: Optional[bytes],
+    headers: Dict[str, str],
+) -> PooledResponse:
+    request = urllib.request.Request(url, body, headers, method=method)
+    try:
+        response: Any = urllib.request.urlopen(request)
+    except urllib.error.HTTPError as e:
+        # Report error statuses the same way the pooled path does.
+        response = e
+    return PooledResponse(response)
@@ -0,0 +1,89 @@
+"""
+Precisely typed versions of hot arithmetic and comparison helpers.
+
+The mypyc build of temper-core compiles this module to native code, where the
+float and int annotations let comparisons skip boxed object operations.
+temper_core swaps these in for its own definitions only when compiled, since
+interpreted they are no faster than the originals.
+"""
+
+from math import copysign, isnan
+
+__all__ = [
+    "float_cmp",
+    "float_eq",
+    "float_not_eq",
+    "float_lt_eq",
+    "float_lt",
+    "float_gt_eq",
+    "float_gt",
+    "generic_cmp",
+    "int_clamp",
+]
+
+COMPILED: bool = not __file__.endswith(".py")
+"Whether this module is native code rather than interpreted Python."
+
+
+def float_cmp(left: float, right: float) -> int:
+    "Three way compares floats, caring about nan and sign of zeroes."
+    if left < right:
+        return -1
+    if left > right:
+        return 1
+    if left == right:
+        if left != 0.0:
+            return 0
+        # Distinguish -0.0 from 0.0.
+        sign_left = copysign(1.0, left)
+        sign_right = copysign(1.0, right)
+        return (sign_left > sign_right) - (sign_left < sign_right)
+    # At least one is nan, and nan sorts after everything else.
+    if isnan(left):
+        return 0 if isnan(right) else 1
+    return -1
+
+
+def float_eq(left: float, right: float) -> bool:
+    "Checks if two floats are exactly equal, caring about nan and sign of zeros."
+    if left == right:
+        return left != 0.0 or copysign(1.0, left) == copysign(1.0, right)
+    return isnan(left) and isnan(right)
+
+
+def float_not_eq(left: float, right: float) -> bool:
+    "Checks if two floats not are exactly equal, caring about nan and sign of zeros."
+    return not float_eq(left, right)
+
+
+def float_lt_eq(left: float, right: float) -> bool:
+    "Checks if left <= right, caring about sign of zeros."
+    return float_cmp(left, right) <= 0
+
+
+def float_lt(left: float, right: float) -> bool:
+    "Checks if left < right, caring about sign of zeros."
+    return float_cmp(left, right) < 0
+
+
+def float_gt_eq(left: float, right: float) -> bool:
+    "Checks if left >= right, caring about sign of zeros."
+    return float_cmp(left, right) >= 0
+
+
+def float_gt(left: float, right: float) -> bool:
+    "Checks if left > right, caring about sign of zeros."
+    return float_cmp(left, right) > 0
+
+
+def generic_cmp(left: object, right: object) -> int:
+    "Three way compares objects, caring about the sign of zeroes of floats."
+    if isinstance(left, float) and isinstance(right, float):
+        return float_cmp(left, right)
+    return (left > right) - (left < right)  # type: ignore[operator]
+
+
+def int_clamp(i: int) -> int:
+    if -0x8000_0000 <= i < 0x8000_0000:
+        return i
+    return ((i + 0x8000_0000) & 0xFFFF_FFFF) - 0x8000_0000
@@ -1,27 +1,119 @@
+import os
 import re
 import typing
+from functools import lru_cache
+from types import MappingProxyType
+
+from . import make_bubble_exception
+
+# Compiled patterns by formatted source.  Each `new Regex(...)` compiles, so
+# code that builds the same regex per call, as request handlers often do,
+# gets its pattern from here.  Module level regexes compile once at import.
+# Unlike re's own cache, other libraries' patterns do not evict ours, and
+# hits and misses can be checked via regex_cache_info.
+_regex_cache_size = int(os.environ.get("TEMPER_CORE_REGEX_CACHE_SIZE") or 512)
+
+
+@lru_cache(maxsize=_regex_cache_size)
+def _compile(formatted: str) -> re.Pattern:
+    return re.compile(formatted, re.ASCII)
+
+
+regex_cache_info = _compile.cache_info
+regex_cache_clear = _compile.cache_clear
 
 
 def regex_compiled_find(_, compiled: re.Pattern, text: str, begin: int, regex_refs):
     match = compiled.search(text, begin)
     if match is None:
-        raise RuntimeError()
+        raise make_bubble_exception()
     return _convert_match(match, regex_refs)
 
 
+def regex_compiled_find_span(
+    _, compiled: re.Pattern, text: str, begin: int
+) -> typing.Tuple[int, int]:
+    """
+    Where the first match at or after begin starts and ends, for callers like
+    tokenizers that do not need Match or Group objects.  Bubbles if none.
+    """
+    match = compiled.search(text, begin)
+    if match is None:
+        raise make_bubble_exception()
+    return match.span()
+
+
+# The std Match and Group classes, and the regex_refs they came from.  There
+# is normally one RegexRefs per process, so remembering the last suffices.
+_match_classes: typing.Tuple[object, typing.Any, typing.Any] = (None, None, None)
+
+
+class _MatchGroups(typing.Mapping[str, typing.Any]):
+    """
+    The named groups that took part in a match, as std Group objects that
+    are only made when looked up.
+    """
+
+    __slots__ = ("_match", "_group_class", "_made")
+
+    def __init__(self, match: re.Match, group_class: typing.Any) -> None:
+        self._match = match
+        self._group_class = group_class
+        # Made on the first lookup, as many matches never have one.
+        self._made: typing.Optional[typing.Dict[str, typing.Any]] = None
+
+    def __getitem__(self, name: str) -> typing.Any:
+        made = self._made
+        if made is None:
+            made = self._made = {}
+        group = made.get(name)
+        if group is None:
+            match = self._match
+            # Check the type as start() would also take group numbers.
+            if not isinstance(name, str) or name not in match.re.groupindex:
+                raise KeyError(name)
+            begin = match.start(name)
+            if begin < 0:
+                raise KeyError(name)
+            value = match.group(name)
+            # Python indices are already in code points.
+            group = self._group_class(name, value, begin, begin + len(value))
+            made[name] = group
+        return group
+
+    def __contains__(self, name: object) -> bool:
+        match = self._match
+        return (
+            isinstance(name, str)
+            and name in match.re.groupindex
+            and match.start(name) >= 0
+        )
+
+    def __iter__(self) -> typing.Iterator[str]:
+        match = self._match
+        return (name for name in match.re.groupindex if match.start(name) >= 0)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+_no_groups: typing.Mapping[str, typing.Any] = MappingProxyType({})
+
+
 def _convert_match(match, regex_refs):
-    Match = regex_refs.match_.__class__
-    Group = regex_refs.match_.full.__class__
-    groups = match.groupdict()
-    # Python indices are already in code points.
+    global _match_classes
+    refs, Match, Group = _match_classes
+    if refs is not regex_refs:
+        match_ = regex_refs.match_
+        refs, Match, Group = regex_refs, match_.__class__, match_.full.__class__
+        _match_classes = (refs, Match, Group)
     full = Group("full", match.group(), match.start(), match.end())
-    result_groups = {}
-    for name, value in groups.items():
-        if value is not None:
-            begin = match.start(name)
-            # Presume string len is faster than end lookup by name.
-            result_groups[name] = Group(name, value, begin, begin + len(value))
-    return Match(full, result_groups)
+    if match.re.groupindex:
+        return Match(full, _MatchGroups(match, Group))
+    return Match(full, _no_groups)
 
 
 def regex_compiled_found(_, compiled: re.Pattern, text: str):
@@ -48,7 +140,7 @@ def regex_compiled_split(_, compiled: re.Pattern, text: str, regex_refs):
 
 
 def regex_compile_formatted(_, formatted: str):
-    return re.compile(formatted, re.ASCII)
+    return _compile(formatted)
 
 
 def regex_formatter_push_capture_name(_, out: typing.MutableSequence[str], name: str):
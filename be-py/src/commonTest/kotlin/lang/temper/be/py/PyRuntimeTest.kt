@@ -33,11 +33,41 @@ class PyRuntimeTest {
         assertIs<RSuccess<*, *>>(result, "Test process failed.")
     }
 
+    @Test
+    fun arith() {
+        runModule("test_arith")
+    }
+
+    @Test
+    fun async() {
+        runModule("test_async")
+    }
+
+    @Test
+    fun bubble() {
+        runModule("test_bubble")
+    }
+
     @Test
     fun collections() {
         runModule("test_collections")
     }
 
+    @Test
+    fun net() {
+        runModule("test_net")
+    }
+
+    @Test
+    fun regex() {
+        runModule("test_regex")
+    }
+
+    @Test
+    fun speedups() {
+        runModule("test_speedups")
+    }
+
     @Test
     fun stringSlice() {
         runModule("test_string_slice")
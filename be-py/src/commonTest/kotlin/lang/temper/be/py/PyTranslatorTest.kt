@@ -1,12 +1,21 @@
 package lang.temper.be.py
 
 import lang.temper.ast.OutTree
+import lang.temper.be.TmplGenerator
 import lang.temper.be.TranslatorTests
 import lang.temper.be.names.LookupNameVisitor
 import lang.temper.be.tmpl.TmpL
+import lang.temper.common.AtomicCounter
 import lang.temper.lexer.Genre
+import lang.temper.name.Symbol
+import lang.temper.type.TypeFormal
+import lang.temper.type.Variance
+import lang.temper.type2.MkType2
+import lang.temper.type2.Type2
 import kotlin.test.Ignore
 import kotlin.test.Test
+import lang.temper.log.unknownPos as p0
+import lang.temper.type.WellKnownTypes as WKT
 
 @SuppressWarnings("MaxLineLength")
 class PyTranslatorTest : TranslatorTests(PyBackend.Python3.backendMeta, PySupportNetwork) {
@@ -46,6 +55,140 @@ class PyTranslatorTest : TranslatorTests(PyBackend.Python3.backendMeta, PySuppor
 
     // override fun missingTest(testName: String) = Unit
 
+    /** `a` compared to `b` via [comparer], where both are of [type]. */
+    private fun TmplGenerator.compare(comparer: PyInlineSupportCode, type: Type2) = TmpL.CallExpression(
+        p0,
+        TmpL.InlineSupportCodeWrapper(p0, type = fn(WKT.booleanType2, type, type), comparer),
+        listOf(makeRef(makeBuiltin("a"), type), makeRef(makeBuiltin("b"), type)),
+        WKT.booleanType2,
+    )
+
+    @Test
+    fun genericEqInt() {
+        doTest("genericEqInt") { compare(GenericEqInliner, WKT.intType2) }
+    }
+
+    @Test
+    fun genericLtString() {
+        doTest("genericLtString") { compare(GenericLtInliner, WKT.stringType2) }
+    }
+
+    @Test
+    fun genericEqFloat64() {
+        doTest("genericEqFloat64") { compare(GenericEqInliner, WKT.float64Type2) }
+    }
+
+    @Test
+    fun genericLtFloat64() {
+        doTest("genericLtFloat64") { compare(GenericLtInliner, WKT.float64Type2) }
+    }
+
+    @Test
+    fun genericEqTypeParameter() {
+        doTest("genericEqTypeParameter") {
+            val typeParamWord = Symbol("T")
+            val typeDefT = TypeFormal(
+                pos = p0,
+                name = makeParsedName(typeParamWord.text),
+                symbol = typeParamWord,
+                variance = Variance.Invariant,
+                mutationCount = AtomicCounter(),
+                upperBounds = emptyList(),
+            )
+            compare(GenericEqInliner, MkType2(typeDefT).get())
+        }
+    }
+
+    @Test
+    fun whileBreakTwoLevels() {
+        doTest("whileBreakTwoLevels") {
+            val outer = makeLabel("outer")
+            block(
+                label(
+                    outer,
+                    whileLoop(
+                        call("outerPredicate", noneToBoolean),
+                        whileLoop(
+                            call("middlePredicate", noneToBoolean),
+                            whileLoop(
+                                call("innerPredicate", noneToBoolean),
+                                ifThen(
+                                    call("earlyPredicate", noneToBoolean),
+                                    breakStmt(outer),
+                                ),
+                            ),
+                        ),
+                    ),
+                ),
+                returnStmt(value(42)),
+            )
+        }
+    }
+
+    @Test
+    fun whileContinueTwoLevels() {
+        doTest("whileContinueTwoLevels") {
+            val outer = makeLabel("outer")
+            block(
+                label(
+                    outer,
+                    whileLoop(
+                        call("outerPredicate", noneToBoolean),
+                        whileLoop(
+                            call("middlePredicate", noneToBoolean),
+                            whileLoop(
+                                call("innerPredicate", noneToBoolean),
+                                ifThen(
+                                    call("skipPredicate", noneToBoolean),
+                                    continueStmt(outer),
+                                ),
+                            ),
+                        ),
+                    ),
+                ),
+                returnStmt(value(42)),
+            )
+        }
+    }
+
+    @Test
+    fun whileLabeledInLabeled() {
+        doTest("whileLabeledInLabeled") {
+            val outer = makeLabel("outer")
+            val inner = makeLabel("inner")
+            block(
+                label(
+                    outer,
+                    whileLoop(
+                        call("outerPredicate", noneToBoolean),
+                        label(
+                            inner,
+                            whileLoop(
+                                call("innerPredicate", noneToBoolean),
+                                whileLoop(
+                                    call("deepPredicate", noneToBoolean),
+                                    ifThen(
+                                        call("skipPredicate", noneToBoolean),
+                                        continueStmt(inner),
+                                    ),
+                                    ifThen(
+                                        call("earlyPredicate", noneToBoolean),
+                                        breakStmt(outer),
+                                    ),
+                                ),
+                                ifThen(
+                                    call("restartPredicate", noneToBoolean),
+                                    continueStmt(outer),
+                                ),
+                            ),
+                        ),
+                    ),
+                ),
+                returnStmt(value(42)),
+            )
+        }
+    }
+
     companion object {
         private val testNameToExpectedCode = mapOf(
             "moduleMinimal" to "",
@@ -126,26 +269,32 @@ class PyTranslatorTest : TranslatorTests(PyBackend.Python3.backendMeta, PySuppor
             "whileBreakNested" to
                 """
                     |before_outer_8()
-                    |with Label0() as outer_7:
-                    |    while outer_predicate_9():
-                    |        before_inner_10()
-                    |        while inner_predicate_11():
-                    |            before_inner_12()
-                    |            if early_predicate_13():
-                    |                before_break_14()
-                    |                outer_7.break_()
-                    |            after_test_15()
-                    |        after_inner_16()
+                    |outer_7_break_0 = False
+                    |while outer_predicate_9():
+                    |    before_inner_10()
+                    |    while inner_predicate_11():
+                    |        before_inner_12()
+                    |        if early_predicate_13():
+                    |            before_break_14()
+                    |            outer_7_break_0 = True
+                    |            break
+                    |        after_test_15()
+                    |    if outer_7_break_0:
+                    |        break
+                    |    after_inner_16()
                     |after_outer_17()
                     |return 42
                 """.trimMargin(),
             "whileBreakNestedSimple" to
                 """
-                    |with Label0() as outer_7:
-                    |    while outer_predicate_8():
-                    |        while inner_predicate_9():
-                    |            if early_predicate_10():
-                    |                outer_7.break_()
+                    |outer_7_break_0 = False
+                    |while outer_predicate_8():
+                    |    while inner_predicate_9():
+                    |        if early_predicate_10():
+                    |            outer_7_break_0 = True
+                    |            break
+                    |    if outer_7_break_0:
+                    |        break
                     |return 42
                 """.trimMargin(),
             "whileContinueSkip" to
@@ -170,40 +319,113 @@ class PyTranslatorTest : TranslatorTests(PyBackend.Python3.backendMeta, PySuppor
             "whileContinueNested" to
                 """
                     |before_outer_8()
-                    |outer_7 = Label0()
+                    |outer_7_continue_0 = False
                     |while outer_predicate_9():
-                    |    with outer_7:
-                    |        before_inner_10()
-                    |        while inner_predicate_11():
-                    |            before_inner_12()
-                    |            if skip_predicate_13():
-                    |                before_continue_14()
-                    |                outer_7.continue_()
-                    |            after_test_15()
-                    |        after_inner_16()
+                    |    before_inner_10()
+                    |    while inner_predicate_11():
+                    |        before_inner_12()
+                    |        if skip_predicate_13():
+                    |            before_continue_14()
+                    |            outer_7_continue_0 = True
+                    |            break
+                    |        after_test_15()
+                    |    if outer_7_continue_0:
+                    |        outer_7_continue_0 = False
+                    |        continue
+                    |    after_inner_16()
                     |after_outer_17()
                     |return 42
                 """.trimMargin(),
             "whileContinueNestedSimple" to
                 """
-                    |outer_7 = Label0()
+                    |outer_7_continue_0 = False
                     |while outer_predicate_8():
-                    |    with outer_7:
-                    |        while inner_predicate_9():
-                    |            if skip_predicate_10():
-                    |                outer_7.continue_()
+                    |    while inner_predicate_9():
+                    |        if skip_predicate_10():
+                    |            outer_7_continue_0 = True
+                    |            break
+                    |    if outer_7_continue_0:
+                    |        outer_7_continue_0 = False
+                    |        continue
                     |return 42
                 """.trimMargin(),
             "whileNestedBreakContinue" to
                 """
-                    |with LabelPair0() as outer_7:
-                    |    while outer_predicate_8():
-                    |        with outer_7.continuing:
-                    |            while inner_predicate_9():
-                    |                if skip_predicate_10():
-                    |                    outer_7.continue_()
-                    |                if early_predicate_11():
-                    |                    outer_7.break_()
+                    |outer_7_break_0 = False
+                    |outer_7_continue_1 = False
+                    |while outer_predicate_8():
+                    |    while inner_predicate_9():
+                    |        if skip_predicate_10():
+                    |            outer_7_continue_1 = True
+                    |            break
+                    |        if early_predicate_11():
+                    |            outer_7_break_0 = True
+                    |            break
+                    |    if outer_7_break_0:
+                    |        break
+                    |    if outer_7_continue_1:
+                    |        outer_7_continue_1 = False
+                    |        continue
+                    |return 42
+                """.trimMargin(),
+            "whileBreakTwoLevels" to
+                """
+                    |outer_7_break_0 = False
+                    |while outer_predicate_8():
+                    |    while middle_predicate_9():
+                    |        while inner_predicate_10():
+                    |            if early_predicate_11():
+                    |                outer_7_break_0 = True
+                    |                break
+                    |        if outer_7_break_0:
+                    |            break
+                    |    if outer_7_break_0:
+                    |        break
+                    |return 42
+                """.trimMargin(),
+            "whileContinueTwoLevels" to
+                """
+                    |outer_7_continue_0 = False
+                    |while outer_predicate_8():
+                    |    while middle_predicate_9():
+                    |        while inner_predicate_10():
+                    |            if skip_predicate_11():
+                    |                outer_7_continue_0 = True
+                    |                break
+                    |        if outer_7_continue_0:
+                    |            break
+                    |    if outer_7_continue_0:
+                    |        outer_7_continue_0 = False
+                    |        continue
+                    |return 42
+                """.trimMargin(),
+            "whileLabeledInLabeled" to
+                """
+                    |outer_7_break_0 = False
+                    |outer_7_continue_1 = False
+                    |while outer_predicate_9():
+                    |    inner_8_continue_2 = False
+                    |    while inner_predicate_10():
+                    |        while deep_predicate_11():
+                    |            if skip_predicate_12():
+                    |                inner_8_continue_2 = True
+                    |                break
+                    |            if early_predicate_13():
+                    |                outer_7_break_0 = True
+                    |                break
+                    |        if outer_7_break_0:
+                    |            break
+                    |        if inner_8_continue_2:
+                    |            inner_8_continue_2 = False
+                    |            continue
+                    |        if restart_predicate_14():
+                    |            outer_7_continue_1 = True
+                    |            break
+                    |    if outer_7_break_0:
+                    |        break
+                    |    if outer_7_continue_1:
+                    |        outer_7_continue_1 = False
+                    |        continue
                     |return 42
                 """.trimMargin(),
             "exprStatementHse" to
@@ -214,6 +436,12 @@ class PyTranslatorTest : TranslatorTests(PyBackend.Python3.backendMeta, PySuppor
             "expressionAssociativityRightAmp" to "a and (b and c)",
             "expressionAssociativityLeftPlus" to "a + b + c",
             "expressionAssociativityRightPlus" to "a + (b + c)",
+            // Python's operators only differ from the generic helpers for floats.
+            "genericEqInt" to "a == b",
+            "genericLtString" to "a < b",
+            "genericEqFloat64" to "generic_eq0(a, b)",
+            "genericLtFloat64" to "generic_lt0(a, b)",
+            "genericEqTypeParameter" to "generic_eq0(a, b)",
             "unexportedClass" to
                 """
                     |class Thing_7:
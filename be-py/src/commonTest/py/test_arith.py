@@ -0,0 +1,99 @@
+import unittest as ut
+import temper_core as rt
+
+
+class TestIntWraparound(ut.TestCase):
+    def test_matches_clamp(self):
+        values = [0, 1, -1, 0x7FFF_FFFF, -0x8000_0000, 0x1_2345_6789, -0x9_8765_4321]
+        for a in values:
+            for b in values:
+                self.assertEqual(rt.int_clamp(a + b), rt.int_add(a, b))
+                self.assertEqual(rt.int_clamp(a - b), rt.int_sub(a, b))
+                self.assertEqual(rt.int_clamp(a * b), rt.int_mul(a, b))
+                self.assertEqual(rt.int64_clamp(a * b), rt.int64_mul(a, b))
+
+    def test_int64_wraps(self):
+        big = 0x7FFF_FFFF_FFFF_FFFF
+        self.assertEqual(-big - 1, rt.int64_add(big, 1))
+        self.assertEqual(big, rt.int64_sub(-big - 1, 1))
+
+
+class TestIntMany(ut.TestCase):
+    def test_int_add_many(self):
+        a = [1, 0x7FFF_FFFF, -0x8000_0000, 5]
+        b = [2, 1, -1, -7]
+        self.assertEqual(
+            tuple(rt.int_add(x, y) for x, y in zip(a, b)),
+            rt.int_add_many(a, b),
+        )
+
+    def test_int_mul_many(self):
+        a = [3, 0x1_0000, -0x8000_0000, 0x7FFF_FFFF]
+        b = [4, 0x1_0000, -1, 0x7FFF_FFFF]
+        self.assertEqual(
+            tuple(rt.int_mul(x, y) for x, y in zip(a, b)),
+            rt.int_mul_many(a, b),
+        )
+
+    def test_int_sub_many_no_overflow(self):
+        self.assertEqual((1, -1, 0), rt.int_sub_many((2, 3, 4), (1, 4, 4)))
+
+    def test_int64_many(self):
+        big = 0x7FFF_FFFF_FFFF_FFFF
+        a = [big, -big - 1, 12]
+        b = [1, 1, -3]
+        self.assertEqual(
+            tuple(rt.int64_add(x, y) for x, y in zip(a, b)),
+            rt.int64_add_many(a, b),
+        )
+        self.assertEqual(
+            tuple(rt.int64_sub(x, y) for x, y in zip(a, b)),
+            rt.int64_sub_many(a, b),
+        )
+        self.assertEqual(
+            tuple(rt.int64_mul(x, y) for x, y in zip(a, b)),
+            rt.int64_mul_many(a, b),
+        )
+
+    def test_many_large_batch(self):
+        # Large enough to take any NumPy path when available.
+        a = [0x7FFF_FFF0 + i for i in range(16)] * 40
+        b = list(range(len(a)))
+        self.assertEqual(
+            tuple(rt.int_add(x, y) for x, y in zip(a, b)),
+            rt.int_add_many(a, b),
+        )
+
+    def test_many_empty(self):
+        self.assertEqual((), rt.int_add_many([], []))
+
+    def test_many_length_mismatch(self):
+        self.assertRaises(ValueError, lambda: rt.int_add_many([1, 2], [1]))
+
+
+class TestComparators(ut.TestCase):
+    def test_comparator_for_float(self):
+        cmp = rt.comparator_for(float)
+        self.assertEqual(-1, cmp(-0.0, 0.0))
+        self.assertEqual(1, cmp(float("nan"), 1.0))
+
+    def test_comparator_for_non_float(self):
+        for py_type, left, right in [(int, 1, 2), (str, "a", "b"), (bool, False, True)]:
+            cmp = rt.comparator_for(py_type)
+            self.assertEqual(-1, cmp(left, right))
+            self.assertEqual(0, cmp(left, left))
+            self.assertEqual(1, cmp(right, left))
+
+    def test_comparator_for_generic(self):
+        self.assertIs(rt.generic_cmp, rt.comparator_for(object))
+        self.assertIs(rt.generic_cmp, rt.comparator_for(rt.TemperComparable))
+
+    def test_equality_for(self):
+        self.assertFalse(rt.equality_for(float)(-0.0, 0.0))
+        self.assertFalse(rt.equality_for(object)(-0.0, 0.0))
+        self.assertTrue(rt.equality_for(str)("a", "a"))
+        self.assertFalse(rt.equality_for(int)(1, 2))
+
+
+if __name__ == "__main__":
+    ut.main()
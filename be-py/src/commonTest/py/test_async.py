@@ -1,9 +1,11 @@
+import asyncio
+import threading
 import unittest as ut
+from concurrent.futures import Future
 import temper_core as rt
 
 class TestAsync(ut.TestCase):
     def test_async(self):
-        from concurrent.futures import Future
         p = Future()
         q = Future()
 
@@ -17,3 +19,327 @@ class TestAsync(ut.TestCase):
         p.set_result('result')
 
         self.assertEqual('result', q.result())
+
+
+class TestAsyncio(ut.TestCase):
+    def setUp(self):
+        self.loop = rt.use_asyncio(asyncio.new_event_loop())
+
+    def tearDown(self):
+        rt.use_threads()
+        self.loop.close()
+
+    def test_launch_on_loop(self):
+        p = rt.new_unbound_promise()
+        self.assertIsInstance(p, asyncio.Future)
+        results = []
+
+        def yielder(do_await):
+            x = yield do_await(p)
+            results.append(x)
+
+        rt.async_launch(rt.adapt_generator_factory(yielder))
+        rt.complete_promise(p, 'result')
+        rt.complete_promise(p, 'ignored')
+        self.loop.run_until_complete(rt._drain_asyncio())
+        self.assertEqual(['result'], results)
+
+    def test_broken_promise_throws_into_coroutine(self):
+        p = rt.new_unbound_promise()
+        caught = []
+
+        def yielder(do_await):
+            try:
+                yield do_await(p)
+            except RuntimeError as e:
+                caught.append(e)
+
+        rt.async_launch(rt.adapt_generator_factory(yielder))
+        rt.break_promise(p)
+        self.loop.run_until_complete(rt._drain_asyncio())
+        self.assertEqual(1, len(caught))
+
+    def test_many_tasks_without_threads(self):
+        gate = rt.new_unbound_promise()
+        done = []
+        threads = set()
+
+        def yielder(do_await, i):
+            yield do_await(gate)
+            threads.add(threading.get_ident())
+            done.append(i)
+
+        adapted = rt.adapt_generator_factory(yielder)
+        for i in range(10_000):
+            rt.async_launch(lambda i=i: adapted(i))
+        rt.complete_promise(gate, None)
+        self.loop.run_until_complete(rt._drain_asyncio())
+        self.assertEqual(10_000, len(done))
+        self.assertEqual({threading.get_ident()}, threads)
+
+    def test_resolve_from_other_thread(self):
+        p = rt.new_unbound_promise()
+        results = []
+
+        def yielder(do_await):
+            results.append((yield do_await(p)))
+
+        async def main():
+            rt.async_launch(rt.adapt_generator_factory(yielder))
+            t = threading.Thread(target=lambda: rt.complete_promise(p, 42))
+            t.start()
+            await rt._drain_asyncio()
+            t.join()
+
+        self.loop.run_until_complete(main())
+        self.assertEqual([42], results)
+
+    def test_failures_go_to_exception_handler(self):
+        reported = []
+        self.loop.set_exception_handler(lambda loop, context: reported.append(context))
+        p = rt.new_unbound_promise()
+
+        def yielder(do_await):
+            yield do_await(p)
+            raise ValueError("oops")
+
+        rt.async_launch(rt.adapt_generator_factory(yielder))
+        rt.complete_promise(p, None)
+        self.loop.run_until_complete(rt._drain_asyncio())
+        self.assertEqual(1, len(reported))
+        self.assertIsInstance(reported[0]["exception"], ValueError)
+
+    def test_use_threads_finishes_tasks(self):
+        done = []
+
+        def yielder(do_await):
+            done.append((yield do_await(rt.promise_all([]))))
+
+        rt.async_launch(rt.adapt_generator_factory(yielder))
+        # Created but never resolved, which use_threads does not wait for.
+        rt.new_unbound_promise()
+        rt.use_threads()
+        self.assertEqual([()], done)
+        self.assertIsNone(rt._asyncio_loop)
+        p = rt.new_unbound_promise()
+        self.assertNotIsInstance(p, asyncio.Future)
+        rt.complete_promise(p, None)
+
+    def test_awaits_concurrent_futures(self):
+        p = Future()
+        results = []
+
+        def yielder(do_await):
+            results.append((yield do_await(p)))
+
+        rt.async_launch(rt.adapt_generator_factory(yielder))
+        p.set_result('threaded')
+        self.loop.run_until_complete(rt._drain_asyncio())
+        self.assertEqual(['threaded'], results)
+
+
+class TestUnresolvedAccounting(ut.TestCase):
+    def test_promises_tracked_until_resolved(self):
+        p = rt.new_unbound_promise()
+        self.assertIn(p, rt._unresolved)
+        rt.complete_promise(p, 1)
+        self.assertNotIn(p, rt._unresolved)
+
+    def test_resolution_from_many_threads(self):
+        promises = [rt.new_unbound_promise() for _ in range(2000)]
+
+        def resolve(ps):
+            for p in ps:
+                rt.complete_promise(p, None)
+
+        threads = [
+            threading.Thread(target=resolve, args=(promises[i::8],))
+            for i in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(all(p not in rt._unresolved for p in promises))
+        self.assertTrue(rt._all_resolved.wait(5))
+
+
+class TestConfigureAsync(ut.TestCase):
+    def tearDown(self):
+        rt.configure_async()
+
+    def test_injected_executor_is_not_shut_down(self):
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            rt.configure_async(executor=executor)
+            q = Future()
+
+            def body(do_await):
+                q.set_result(threading.current_thread().name)
+                yield from ()
+
+            rt.async_launch(rt.adapt_generator_factory(body))
+            rt.await_safe_to_exit()
+            self.assertIs(executor, rt._executor)
+            # Still usable after await_safe_to_exit.
+            self.assertEqual(2, executor.submit(lambda: 2).result())
+            self.assertNotEqual(threading.current_thread().name, q.result())
+
+    def test_owned_executor_is_recreated(self):
+        rt.configure_async(max_workers=2)
+        q = Future()
+
+        def body(do_await):
+            q.set_result(threading.current_thread().name)
+            yield from ()
+
+        rt.async_launch(rt.adapt_generator_factory(body))
+        self.assertTrue(q.result().startswith("temper-async"))
+        rt.await_safe_to_exit()
+        self.assertIsNone(rt._executor)
+        p = Future()
+
+        def again(do_await):
+            p.set_result((yield do_await(q)))
+
+        rt.async_launch(rt.adapt_generator_factory(again))
+        self.assertTrue(p.result().startswith("temper-async"))
+
+    def test_rejects_process_pool(self):
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=1)
+        try:
+            self.assertRaises(
+                TypeError, lambda: rt.configure_async(executor=executor)
+            )
+        finally:
+            executor.shutdown()
+
+
+class TestReadyAwaits(ut.TestCase):
+    def test_long_chain_of_ready_awaits(self):
+        ready = Future()
+        ready.set_result(1)
+        failed = Future()
+        failed.set_exception(ValueError())
+        out = Future()
+
+        def body(do_await):
+            total = 0
+            for _ in range(10_000):
+                total += yield do_await(ready)
+                try:
+                    yield do_await(failed)
+                except ValueError:
+                    total += 1
+            out.set_result(total)
+
+        rt.async_launch(rt.adapt_generator_factory(body))
+        self.assertEqual(20_000, out.result(timeout=10))
+
+
+class TestPromiseCombinators(ut.TestCase):
+    def test_all(self):
+        ps = [rt.new_unbound_promise() for _ in range(3)]
+        combined = rt.promise_all(ps)
+        for i, p in reversed(list(enumerate(ps))):
+            self.assertFalse(combined.done())
+            rt.complete_promise(p, i)
+        self.assertEqual((0, 1, 2), combined.result(timeout=1))
+        self.assertEqual((), rt.promise_all([]).result(timeout=1))
+
+    def test_all_breaks_early(self):
+        ps = [rt.new_unbound_promise() for _ in range(3)]
+        combined = rt.promise_all(ps)
+        rt.break_promise(ps[1], ValueError("no"))
+        self.assertIsInstance(combined.exception(timeout=1), ValueError)
+        self.assertFalse(ps[0].done())
+        rt.complete_promise(ps[0], 0)
+        rt.complete_promise(ps[2], 2)
+
+    def test_cancelling_combined_cancels_inputs(self):
+        ps = [rt.new_unbound_promise() for _ in range(2)]
+        rt.complete_promise(ps[0], 0)
+        combined = rt.promise_all(ps)
+        rt.cancel_promise(combined)
+        self.assertTrue(combined.cancelled())
+        self.assertFalse(ps[0].cancelled())
+        self.assertTrue(ps[1].cancelled())
+
+    def test_race_and_any(self):
+        a, b = rt.new_unbound_promise(), rt.new_unbound_promise()
+        race = rt.promise_race([a, b])
+        first = rt.promise_any([a, b])
+        rt.break_promise(b, ValueError())
+        self.assertIsInstance(race.exception(timeout=1), ValueError)
+        self.assertFalse(first.done())
+        rt.complete_promise(a, "a")
+        self.assertEqual("a", first.result(timeout=1))
+        self.assertRaises(ValueError, lambda: rt.promise_race([]))
+
+    def test_any_breaks_like_last(self):
+        a, b = rt.new_unbound_promise(), rt.new_unbound_promise()
+        first = rt.promise_any([a, b])
+        rt.break_promise(a, KeyError())
+        rt.break_promise(b, ValueError())
+        self.assertIsInstance(first.exception(timeout=1), ValueError)
+
+    def test_timeout(self):
+        slow = rt.new_unbound_promise()
+        timed = rt.promise_with_timeout(slow, 0.01)
+        self.assertIsInstance(timed.exception(timeout=5), TimeoutError)
+        self.assertTrue(slow.cancelled())
+        fast = rt.new_unbound_promise()
+        timed = rt.promise_with_timeout(fast, 60)
+        rt.complete_promise(fast, 1)
+        self.assertEqual(1, timed.result(timeout=1))
+
+    def test_many_timeouts_share_a_thread(self):
+        threads_before = threading.active_count()
+        slow = [rt.new_unbound_promise() for _ in range(200)]
+        timed = [rt.promise_with_timeout(p, 0.05) for p in slow]
+        fast = [rt.new_unbound_promise() for _ in range(200)]
+        kept = [rt.promise_with_timeout(p, 60) for p in fast]
+        self.assertLessEqual(threading.active_count(), threads_before + 1)
+        for i, p in enumerate(fast):
+            rt.complete_promise(p, i)
+        self.assertEqual(list(range(200)), [t.result(timeout=1) for t in kept])
+        for t in timed:
+            self.assertIsInstance(t.exception(timeout=5), TimeoutError)
+        self.assertTrue(all(p.cancelled() for p in slow))
+        self.assertLessEqual(threading.active_count(), threads_before + 1)
+
+    def test_coroutine_awaits_all(self):
+        ps = [rt.new_unbound_promise() for _ in range(3)]
+        out = Future()
+
+        def body(do_await):
+            out.set_result((yield do_await(rt.promise_all(ps))))
+
+        rt.async_launch(rt.adapt_generator_factory(body))
+        for i, p in enumerate(ps):
+            rt.complete_promise(p, i)
+        self.assertEqual((0, 1, 2), out.result(timeout=1))
+
+    def test_on_asyncio_loop(self):
+        loop = rt.use_asyncio(asyncio.new_event_loop())
+        try:
+            slow = rt.new_unbound_promise()
+            fast = rt.new_unbound_promise()
+            caught = []
+
+            def body(do_await):
+                try:
+                    yield do_await(rt.promise_with_timeout(slow, 0.01))
+                except TimeoutError:
+                    caught.append("timeout")
+                caught.append((yield do_await(rt.promise_all([fast]))))
+
+            rt.async_launch(rt.adapt_generator_factory(body))
+            rt.complete_promise(fast, "fast")
+            loop.run_until_complete(rt._drain_asyncio())
+            self.assertEqual(["timeout", ("fast",)], caught)
+            self.assertTrue(slow.cancelled())
+        finally:
+            rt.use_threads()
+            loop.close()
@@ -0,0 +1,60 @@
+import threading
+import unittest as ut
+import temper_core as rt
+
+
+class TestBubble(ut.TestCase):
+    def test_bubble_is_runtime_error(self):
+        self.assertRaises(RuntimeError, rt.bubble)
+
+    @ut.skipIf(rt._debug_bubbles, "bubbles are not shared while debugging")
+    def test_fast_bubble_drops_old_state(self):
+        try:
+            try:
+                raise ValueError()
+            except ValueError:
+                rt.bubble()
+        except RuntimeError as exc:
+            first = exc
+            self.assertTrue(exc.__suppress_context__)
+        try:
+            rt.bubble()
+        except RuntimeError as exc:
+            self.assertIs(first, exc)
+            self.assertIsNone(exc.__context__)
+            # Only frames from this raise.
+            depth = 0
+            tb = exc.__traceback__
+            while tb is not None:
+                depth += 1
+                tb = tb.tb_next
+            self.assertEqual(2, depth)
+
+    @ut.skipIf(rt._debug_bubbles, "bubbles are not shared while debugging")
+    def test_threads_do_not_share_bubbles(self):
+        other = []
+        thread = threading.Thread(target=lambda: other.append(rt.make_bubble_exception()))
+        thread.start()
+        thread.join()
+        self.assertIs(rt.make_bubble_exception(), rt.make_bubble_exception())
+        self.assertIsNot(other[0], rt.make_bubble_exception())
+        self.assertIs(RuntimeError, type(other[0]))
+
+    def test_bubble_while_handling_bubble(self):
+        def retry():
+            try:
+                rt.bubble()
+            except RuntimeError:
+                rt.bubble()
+
+        self.assertRaises(RuntimeError, retry)
+
+    def test_broken_promise_gets_own_exception(self):
+        p = rt.new_unbound_promise()
+        rt.break_promise(p)
+        self.assertIsNot(rt.make_bubble_exception(), p.exception())
+        self.assertIsInstance(p.exception(), RuntimeError)
+
+
+if __name__ == "__main__":
+    ut.main()
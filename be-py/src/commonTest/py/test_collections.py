@@ -104,6 +104,136 @@ class TestLists(ut.TestCase):
         )
 
 
+class TestListViews(ut.TestCase):
+    source = tuple(range(100))
+
+    def test_slice_of_tuple_is_view(self):
+        view = rt.list_slice(self.source, 10, 90)
+        self.assertIsInstance(view, rt.ListView)
+        self.assertEqual(tuple(range(10, 90)), view)
+        self.assertEqual(view, tuple(range(10, 90)))
+        self.assertEqual(80, len(view))
+        self.assertEqual(10, rt.list_get(view, 0))
+        self.assertEqual(89, view[-1])
+        self.assertRaises(IndexError, lambda: rt.list_get(view, 80))
+        self.assertRaises(IndexError, lambda: rt.list_get(view, -1))
+        self.assertIs(view, rt.listed_to_list(view))
+
+    def test_slice_of_view(self):
+        view = rt.list_slice(rt.list_slice(self.source, 10, 90), 5, 45)
+        self.assertIs(self.source, view._source)
+        self.assertEqual(tuple(range(15, 55)), view)
+        self.assertEqual(tuple(range(54, 14, -1)), tuple(reversed(view)))
+        self.assertEqual(tuple(range(15, 55, 2)), view[::2])
+        self.assertEqual(hash(tuple(range(15, 55))), hash(view))
+
+    def test_short_or_mutable_slices_copy(self):
+        self.assertEqual((3, 4), rt.list_slice(self.source, 3, 5))
+        self.assertIsInstance(rt.list_slice(self.source, 3, 5), tuple)
+        self.assertIsInstance(rt.list_slice(list(self.source), 0, 100), tuple)
+
+    def test_slice_bounds(self):
+        self.assertEqual((), rt.list_slice(self.source, 50, 10))
+        self.assertEqual((), rt.list_slice(self.source, 200, 300))
+        self.assertEqual(self.source[60:], rt.list_slice(self.source, 60, 300))
+        self.assertEqual(self.source[:2], rt.list_slice(self.source, -5, 2))
+
+    def test_list_helpers_accept_views(self):
+        view = rt.list_slice(self.source, 0, 40)
+        self.assertEqual(tuple(range(0, 400, 10)), rt.list_map(view, self.map10))
+        self.assertEqual(
+            "0,1,2", rt.list_join(rt.list_slice(view, 0, 3), ",", str)
+        )
+        lst = [1]
+        rt.list_builder_add_all(lst, rt.list_slice(view, 1, 35))
+        self.assertEqual(list(range(1, 35)), lst[1:])
+
+    @staticmethod
+    def map10(x):
+        return x * 10
+
+
+class TestLazyListed(ut.TestCase):
+    def test_fused_chain(self):
+        calls = []
+
+        def times10(x):
+            calls.append(x)
+            return x * 10
+
+        lazy = rt.LazyListed(range(10)).filter(lambda x: x % 3 == 0).map(times10)
+        self.assertEqual([], calls)
+        self.assertEqual(180, lazy.reduce(lambda a, b: a + b))
+        self.assertEqual([0, 3, 6, 9], calls)
+        # Reusable, like any other Listed.
+        self.assertEqual((0, 30, 60, 90), lazy.to_list())
+        self.assertEqual("0|30|60|90", lazy.join("|", str))
+
+    def test_streams_without_materializing(self):
+        def source():
+            yield from range(5)
+            raise AssertionError("read past the first element")
+
+        lazy = rt.LazyListed(source()).map(lambda x: x + 1)
+        self.assertEqual(1, next(iter(lazy)))
+
+    def test_map_dropping_and_reduce_from(self):
+        def checked(x):
+            if x == 2:
+                raise ValueError()
+            return x
+
+        lazy = rt.LazyListed((1, 2, 3)).map_dropping(checked)
+        self.assertEqual((1, 3), lazy.to_list())
+        self.assertEqual("13", lazy.reduce_from("", lambda acc, x: acc + str(x)))
+        seen = []
+        lazy.for_each(seen.append)
+        self.assertEqual([1, 3], seen)
+
+    def test_to_list_without_steps(self):
+        source = (1, 2, 3)
+        self.assertIs(source, rt.LazyListed(source).to_list())
+        self.assertRaises(TypeError, lambda: rt.LazyListed(()).reduce(max))
+
+
+class TestSorting(ut.TestCase):
+    floats = [3.0, float("nan"), -0.0, 0.0, -1.5, float("inf"), 0.0, -0.0]
+
+    def test_float_cmp_matches_cmp_to_key(self):
+        from functools import cmp_to_key
+        expected = sorted(self.floats, key=cmp_to_key(rt.float_cmp))
+        actual = rt.listed_sorted(self.floats, rt.float_cmp)
+        self.assertEqual(repr(tuple(expected)), repr(actual))
+
+    def test_generic_cmp(self):
+        self.assertEqual((1, 2, 3), rt.listed_sorted([3, 1, 2], rt.generic_cmp))
+        self.assertEqual(
+            "(-0.0, 0.0, nan)",
+            repr(rt.listed_sorted([float("nan"), 0.0, -0.0], rt.generic_cmp)),
+        )
+
+    def test_comparator_by_key_is_stable(self):
+        records = [("b", 2), ("a", 1), ("c", 2), ("d", 1)]
+        by_num = rt.comparator_by_key(lambda r: r[1])
+        self.assertEqual(
+            (("a", 1), ("d", 1), ("b", 2), ("c", 2)),
+            rt.listed_sorted(records, by_num),
+        )
+        self.assertEqual(-1, by_num(("a", 1), ("b", 2)))
+
+    def test_reversed_comparator(self):
+        records = [("b", 2), ("a", 1), ("c", 2), ("d", 1)]
+        by_num_desc = rt.reversed_comparator(rt.comparator_by_key(lambda r: r[1]))
+        lst = list(records)
+        rt.list_builder_sort(lst, by_num_desc)
+        self.assertEqual([("b", 2), ("c", 2), ("a", 1), ("d", 1)], lst)
+
+    def test_arbitrary_comparator(self):
+        lst = [5, 3, 9, 1]
+        rt.list_builder_sort(lst, lambda a, b: b - a)
+        self.assertEqual([9, 5, 3, 1], lst)
+
+
 class TestDeques(ut.TestCase):
     def deque456(self):
         deq = deque()
@@ -132,6 +262,20 @@ class TestDeques(ut.TestCase):
         self.assertEqual([], list(deq))
 
 
+class TestSymbols(ut.TestCase):
+    def test_interned(self):
+        self.assertIs(rt.Symbol("x"), rt.Symbol("x"))
+        self.assertEqual(rt.Symbol("x"), rt.Symbol("".join(["x"])))
+        self.assertNotEqual(rt.Symbol("x"), rt.Symbol("y"))
+        self.assertEqual({rt.Symbol("x"): 1}[rt.Symbol("x")], 1)
+        self.assertRaises(NotImplementedError, lambda: rt.Symbol("x") == "x")
+
+    def test_pickle_keeps_identity(self):
+        import pickle
+        sym = rt.Symbol("pickled")
+        self.assertIs(sym, pickle.loads(pickle.dumps(sym)))
+
+
 class TestDenseBitVectors(ut.TestCase):
     def test_construct_0(self):
         dbv = rt.DenseBitVector(0)
@@ -162,6 +306,114 @@ class TestDenseBitVectors(ut.TestCase):
             [idx for idx in range(-50, 50) if dbv.get(idx)],
         )
 
+    def test_any_and_count(self):
+        dbv = rt.DenseBitVector(64)
+        self.assertFalse(dbv)
+        dbv.set(40, True)
+        dbv.set(40, True)
+        self.assertTrue(dbv)
+        self.assertEqual(1, dbv.bit_count())
+        dbv.set(40, False)
+        dbv.set(41, False)
+        self.assertFalse(dbv)
+        self.assertEqual(0, dbv.bit_count())
+
+    def test_ranges(self):
+        dbv = rt.DenseBitVector(0)
+        dbv.set_range(3, 21, True)
+        self.assertEqual(list(range(3, 21)), list(dbv.set_bits()))
+        self.assertEqual(18, dbv.bit_count())
+        dbv.set_range(5, 17, False)
+        dbv.set_range(100, 200, False)
+        self.assertEqual([3, 4, 17, 18, 19, 20], list(dbv.set_bits()))
+        self.assertEqual(6, dbv.bit_count())
+        self.assertEqual(3, len(bytes(dbv)))
+
+    def test_next_set_bit(self):
+        dbv = rt.DenseBitVector(0)
+        for idx in (5, 6, 300):
+            dbv.set(idx, True)
+        found = []
+        idx = dbv.next_set_bit(-3)
+        while idx >= 0:
+            found.append(idx)
+            idx = dbv.next_set_bit(idx + 1)
+        self.assertEqual([5, 6, 300], found)
+        self.assertEqual(-1, dbv.next_set_bit(1000))
+
+    def test_bulk_ops(self):
+        def bits(*indices):
+            dbv = rt.DenseBitVector(0)
+            for idx in indices:
+                dbv.set(idx, True)
+            return dbv
+
+        a = bits(1, 2, 3, 70)
+        ops = [
+            ("and_", [2, 70]),
+            ("or_", [1, 2, 3, 9, 70, 200]),
+            ("xor", [1, 3, 9, 200]),
+            ("and_not", [1, 3]),
+        ]
+        for op, expected in ops:
+            result = a.copy()
+            getattr(result, op)(bits(2, 9, 70, 200))
+            self.assertEqual(expected, list(result.set_bits()), msg=op)
+            self.assertEqual(len(expected), result.bit_count(), msg=op)
+        self.assertEqual([1, 2, 3, 70], list(a.set_bits()))
+
+
+class TestMappedDenseBitVectors(ut.TestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+    def test_persists(self):
+        with rt.DenseBitVector.open_mmap(self.path, 100) as dbv:
+            self.assertFalse(dbv)
+            dbv.set(3, True)
+            dbv.set_range(40, 50, True)
+            dbv.set(45, False)
+            self.assertEqual(10, dbv.bit_count())
+        with rt.DenseBitVector.open_mmap(self.path, 10) as dbv:
+            self.assertTrue(dbv.get(3))
+            self.assertFalse(dbv.get(45))
+            self.assertEqual(46, dbv.next_set_bit(45))
+            self.assertEqual(13, len(dbv.as_memoryview()))
+
+    def test_shared_between_mappings(self):
+        with rt.DenseBitVector.open_mmap(self.path, 64) as a:
+            with rt.DenseBitVector.open_mmap(self.path, 64) as b:
+                b.set(7, True)
+                self.assertTrue(a)
+                self.assertTrue(a.get(7))
+                self.assertEqual(1, a.bit_count())
+
+    def test_grows_and_bulk_ops(self):
+        with rt.DenseBitVector.open_mmap(self.path, 0) as dbv:
+            dbv.set(100, True)
+            other = rt.DenseBitVector(0)
+            other.set(500, True)
+            dbv.or_(other)
+            self.assertEqual([100, 500], list(dbv.set_bits()))
+            copy = dbv.copy()
+        self.assertEqual(2, copy.bit_count())
+        self.assertEqual(0x10, bytes(copy)[12])
+        self.assertEqual(63, len(bytes(copy)))
+
+    def test_bytes_trims_large_mapping(self):
+        with rt.DenseBitVector.open_mmap(self.path, 100_000) as dbv:
+            self.assertEqual(b"", bytes(dbv))
+            dbv.set(9, True)
+            self.assertEqual(b"\x00\x02", bytes(dbv))
+            dbv.set(50_000, True)
+            self.assertEqual(6251, len(bytes(dbv)))
+        # No views of the mapping were left open.
+        self.assertTrue(dbv._bytearray.closed)
+
 
 if __name__ == "__main__":
     ut.main()
@@ -0,0 +1,207 @@
+import asyncio
+import threading
+import unittest as ut
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from temper_core._net import ConnectionPool
+import temper_core as rt
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        if self.path == "/redirect":
+            self._reply(302, b"", location="/hello")
+        elif self.path == "/then-close":
+            # Hang up without saying so, like a server timing out an idle
+            # keep-alive connection.
+            self._reply(200, b"Bye")
+            self.close_connection = True
+        elif self.path == "/latin":
+            self._reply(200, "café".encode("latin-1"), "text/plain; charset=ISO-8859-1")
+        elif self.path == "/big":
+            self._reply(200, bytes(range(256)) * 1024, "application/octet-stream")
+        elif self.path == "/hello":
+            self._reply(200, b"Hello", content_type="text/plain")
+        else:
+            self._reply(404, b"missing")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["content-length"]))
+        if self.path == "/see-other":
+            self._reply(303, b"", location="/hello")
+        else:
+            self._reply(200, body, content_type=self.headers["content-type"])
+
+    def _reply(self, status, body, content_type="text/plain", location=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if location is not None:
+            self.send_header("Location", location)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool(ut.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        cls.server.lock = threading.Lock()
+        cls.server.connections = 0
+        # Clients hanging up mid-response is expected.
+        cls.server.handle_error = lambda request, client_address: None
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.pool = ConnectionPool(max_per_host=2)
+        with self.server.lock:
+            self.server.connections = 0
+
+    def tearDown(self):
+        self.pool.close()
+
+    def get(self, path, method="GET", body=None, headers=None):
+        with self.pool.request(method, self.base + path, body, headers) as response:
+            return response.status, response.read()
+
+    def test_reuses_connections(self):
+        for _ in range(5):
+            self.assertEqual((200, b"Hello"), self.get("/hello"))
+        self.assertEqual(1, self.server.connections)
+
+    def test_error_status_is_a_response(self):
+        self.assertEqual((404, b"missing"), self.get("/nope"))
+
+    def test_follows_redirects(self):
+        self.assertEqual((200, b"Hello"), self.get("/redirect"))
+        self.assertEqual(
+            (200, b"Hello"),
+            self.get("/see-other", "POST", b"x", {"content-type": "text/plain"}),
+        )
+        self.assertEqual(1, self.server.connections)
+
+    def test_bounds_connections_per_host(self):
+        results = []
+
+        def fetch():
+            results.append(self.get("/hello"))
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([(200, b"Hello")] * 8, results)
+        self.assertLessEqual(self.server.connections, 2)
+
+    def test_replaces_connections_closed_by_server(self):
+        self.assertEqual((200, b"Bye"), self.get("/then-close"))
+        self.assertEqual((200, b"Hello"), self.get("/hello"))
+        self.assertEqual(2, self.server.connections)
+
+    def test_std_net_send(self):
+        response = rt.std_net_send(self.base + "/echo", "POST", "hi", "text/plain")
+        response = response.result(timeout=5)
+        self.assertEqual(200, response.status)
+        self.assertEqual("text/plain", response.content_type)
+        self.assertEqual("hi", response.text.result(timeout=5))
+
+
+    def test_headers_are_case_insensitive(self):
+        response = rt.std_net_send(self.base + "/hello", "GET", None, None)
+        response = response.result(timeout=5)
+        self.assertEqual("text/plain", response.headers["CONTENT-TYPE"])
+        self.assertIn("Content-Length", response.headers)
+        self.assertEqual("text/plain", response.content_type)
+
+    def test_decodes_charset(self):
+        response = rt.std_net_send(self.base + "/latin", "GET", None, None)
+        response = response.result(timeout=5)
+        self.assertEqual("iso8859-1", response.charset)
+        self.assertEqual("café", response.text.result(timeout=5))
+        self.assertEqual("café".encode("latin-1"), response.body.result(timeout=5))
+
+    def test_charset_of(self):
+        self.assertEqual("utf-8", rt._charset_of(None))
+        self.assertEqual("utf-8", rt._charset_of("text/plain"))
+        self.assertEqual("utf-8", rt._charset_of("text/plain; charset=bogus"))
+        self.assertEqual("utf-16", rt._charset_of('text/plain; Charset="UTF-16"'))
+
+    def test_streams_chunks(self):
+        response = rt.std_net_send(self.base + "/big", "GET", None, None, stream=True)
+        response = response.result(timeout=5)
+
+        async def collect():
+            sizes = []
+            async for chunk in response.chunks(4096):
+                self.assertLessEqual(len(chunk), 4096)
+                sizes.append(len(chunk))
+            return sizes
+
+        sizes = asyncio.run(collect())
+        self.assertEqual(256 * 1024, sum(sizes))
+        self.assertGreater(len(sizes), 1)
+        self.assertRaises(RuntimeError, lambda: response.body)
+
+    def test_stopping_stream_early(self):
+        response = rt.std_net_send(self.base + "/big", "GET", None, None, stream=True)
+        response = response.result(timeout=5)
+
+        async def first():
+            async for chunk in response.chunks(16):
+                return chunk
+
+        self.assertEqual(bytes(range(16)), asyncio.run(first()))
+        response.close()
+        self.assertRaises(RuntimeError, response.chunks)
+
+    def test_closing_unread_stream_frees_connection(self):
+        pool = rt._get_net_pool()
+        for _ in range(pool.max_per_host + 1):
+            response = rt.std_net_send(
+                self.base + "/big", "GET", None, None, stream=True
+            )
+            response.result(timeout=5).close()
+
+    def test_closing_pool_closes_checked_out_connections(self):
+        response = self.pool.request("GET", self.base + "/hello")
+        self.pool.close()
+        self.assertEqual(b"Hello", response.read())
+        response.close()
+        self.assertEqual({}, self.pool._idle)
+        self.assertEqual((200, b"Hello"), self.get("/hello"))
+        self.assertEqual(2, self.server.connections)
+
+    def test_configure_net_retires_old_pool(self):
+        old = rt._get_net_pool()
+        response = rt.std_net_send(self.base + "/big", "GET", None, None, stream=True)
+        response = response.result(timeout=5)
+        rt.configure_net()
+        self.assertIsNot(old, rt._get_net_pool())
+
+        async def read():
+            return b"".join([chunk async for chunk in response.chunks()])
+
+        # Reading to the end releases the connection to the old pool.
+        self.assertEqual(256 * 1024, len(asyncio.run(read())))
+        self.assertEqual({}, old._idle)
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -0,0 +1,93 @@
+import re
+import unittest as ut
+from temper_core import regex
+
+
+class TestCompileCache(ut.TestCase):
+    def setUp(self):
+        regex.regex_cache_clear()
+
+    def test_reuses_compiled_patterns(self):
+        formatted = r"a\U00000062+"
+        first = regex.regex_compile_formatted(None, formatted)
+        second = regex.regex_compile_formatted(None, formatted)
+        self.assertIs(first, second)
+        info = regex.regex_cache_info()
+        self.assertEqual((1, 1, 1), (info.hits, info.misses, info.currsize))
+        self.assertTrue(first.flags & re.ASCII)
+
+    def test_bounded(self):
+        maxsize = regex.regex_cache_info().maxsize
+        for i in range(maxsize + 10):
+            regex.regex_compile_formatted(None, f"x{i}")
+        self.assertEqual(maxsize, regex.regex_cache_info().currsize)
+
+
+
+class Group:
+    def __init__(self, name, value, begin, end):
+        self.name, self.value, self.begin, self.end = name, value, begin, end
+
+
+class Match:
+    def __init__(self, full, groups):
+        self.full, self.groups = full, groups
+
+
+class RegexRefs:
+    def __init__(self):
+        self.match_ = Match(Group("", "", 0, 0), {})
+
+
+class TestFind(ut.TestCase):
+    refs = RegexRefs()
+    pattern = regex.regex_compile_formatted(
+        None, r"(?P<word>[a-z]+)|(?P<num>[0-9]+)"
+    )
+
+    def test_groups(self):
+        match = regex.regex_compiled_find(None, self.pattern, " 12", 0, self.refs)
+        self.assertIsInstance(match, Match)
+        full = match.full
+        self.assertEqual(
+            ("full", "12", 1, 3), (full.name, full.value, full.begin, full.end)
+        )
+        self.assertEqual(["num"], list(match.groups))
+        self.assertEqual(1, len(match.groups))
+        self.assertIn("num", match.groups)
+        self.assertNotIn("word", match.groups)
+        self.assertNotIn(1, match.groups)
+        num = match.groups["num"]
+        self.assertEqual(("num", "12", 1, 3), (num.name, num.value, num.begin, num.end))
+        self.assertIs(num, match.groups["num"])
+        self.assertRaises(KeyError, lambda: match.groups["word"])
+        self.assertRaises(KeyError, lambda: match.groups["nope"])
+        self.assertEqual(None, match.groups.get("word"))
+
+    def test_no_named_groups(self):
+        pattern = regex.regex_compile_formatted(None, "b+")
+        match = regex.regex_compiled_find(None, pattern, "abbc", 0, self.refs)
+        self.assertEqual(("bb", 1, 3), (match.full.value, match.full.begin, match.full.end))
+        self.assertEqual({}, dict(match.groups))
+
+    def test_find_span(self):
+        self.assertEqual(
+            (4, 7), regex.regex_compiled_find_span(None, self.pattern, "12  abc", 2)
+        )
+        self.assertRaises(
+            RuntimeError,
+            lambda: regex.regex_compiled_find_span(None, self.pattern, "12 ", 2),
+        )
+
+    def test_replace_sees_groups(self):
+        def format(match):
+            return "<" + ",".join(match.groups) + ">"
+
+        self.assertEqual(
+            "<word> <num>",
+            regex.regex_compiled_replace(None, self.pattern, "ab 12", format, self.refs),
+        )
+
+
+if __name__ == "__main__":
+    ut.main()
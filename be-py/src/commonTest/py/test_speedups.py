@@ -0,0 +1,121 @@
+import unittest as ut
+import temper_core as rt
+from temper_core import _speedups
+from math import inf, nan
+
+
+floats = [-inf, -1.5, -0.0, 0.0, 2.0, 3.25, inf, nan, -nan]
+
+ints = [
+    0,
+    -1,
+    0x7FFF_FFFF,
+    0x8000_0000,
+    -0x8000_0000,
+    -0x8000_0001,
+    0x1_2345_6789,
+    -0x1_2345_6789,
+]
+
+
+def original(name):
+    "The pure Python helper, even when compiled helpers have replaced it."
+    return rt._replaced_helpers.get(name, getattr(rt, name))
+
+
+class TestSpeedups(ut.TestCase):
+    "Native helpers must agree with the pure Python versions they replace."
+
+    def test_float_helpers(self):
+        for name in _speedups.__all__:
+            if name == "int_clamp":
+                continue
+            fast = getattr(_speedups, name)
+            slow = original(name)
+            for left in floats:
+                for right in floats:
+                    self.assertEqual(
+                        slow(left, right),
+                        fast(left, right),
+                        msg=f"{name}({left!r}, {right!r})",
+                    )
+
+    def test_nan_and_signed_zero(self):
+        # Lists rather than dicts, since (-0.0, 0.0) == (0.0, -0.0).
+        expected = {
+            "float_cmp": [
+                (-0.0, 0.0, -1),
+                (0.0, -0.0, 1),
+                (nan, nan, 0),
+                (nan, inf, 1),
+                (inf, nan, -1),
+            ],
+            "float_eq": [
+                (-0.0, 0.0, False),
+                (0.0, 0.0, True),
+                (nan, nan, True),
+                (nan, 1.0, False),
+            ],
+            "float_not_eq": [
+                (-0.0, 0.0, True),
+                (-0.0, -0.0, False),
+                (nan, nan, False),
+                (1.0, nan, True),
+            ],
+            "float_lt_eq": [
+                (-0.0, 0.0, True),
+                (0.0, -0.0, False),
+                (nan, nan, True),
+                (nan, inf, False),
+            ],
+            "float_lt": [
+                (-0.0, 0.0, True),
+                (0.0, 0.0, False),
+                (nan, nan, False),
+                (inf, nan, True),
+            ],
+            "float_gt_eq": [
+                (0.0, -0.0, True),
+                (-0.0, 0.0, False),
+                (nan, nan, True),
+                (inf, nan, False),
+            ],
+            "float_gt": [
+                (0.0, -0.0, True),
+                (-0.0, -0.0, False),
+                (nan, nan, False),
+                (nan, inf, True),
+            ],
+            "generic_cmp": [
+                (-0.0, 0.0, -1),
+                (0.0, -0.0, 1),
+                (nan, nan, 0),
+                (nan, -inf, 1),
+            ],
+        }
+        self.assertEqual(set(_speedups.__all__) - {"int_clamp"}, set(expected))
+        for name, cases in expected.items():
+            for helper in (getattr(_speedups, name), original(name)):
+                for left, right, result in cases:
+                    self.assertEqual(
+                        result,
+                        helper(left, right),
+                        msg=f"{name}({left!r}, {right!r})",
+                    )
+
+    def test_generic_cmp_non_float(self):
+        for helper in (_speedups.generic_cmp, original("generic_cmp")):
+            self.assertEqual(-1, helper("a", "b"))
+            self.assertEqual(0, helper(3, 3))
+            self.assertEqual(1, helper(4, 3))
+
+    def test_int_clamp(self):
+        slow = original("int_clamp")
+        for i in ints:
+            self.assertEqual(slow(i), _speedups.int_clamp(i), msg=f"int_clamp({i!r})")
+        self.assertEqual(-0x8000_0000, _speedups.int_clamp(0x8000_0000))
+        self.assertEqual(0x7FFF_FFFF, _speedups.int_clamp(-0x8000_0001))
+
+
+if __name__ == "__main__":
+    ut.main()
@@ -91,3 +91,117 @@ class TestStringHelpers(ut.TestCase):
                 'prevs': prevs,
             }
         )
+
+    def test_step(self):
+        for i in valid_and_invalid_string_indices:
+            for by in range(-10, 11):
+                j = i
+                for _ in range(abs(by)):
+                    j = rt.string_next(str, j) if by > 0 else rt.string_prev(str, j)
+                self.assertEqual(j, rt.string_step(str, i, by), msg=f"i={i}, by={by}")
+
+
+class TestStringCursor(ut.TestCase):
+    def test_advance_clamps(self):
+        cursor = rt.StringCursor(str)
+        self.assertEqual(0x3BA, cursor.peek())
+        self.assertEqual(5, cursor.advance(5))
+        self.assertEqual(0x1D20E, cursor.peek())
+        self.assertEqual(3, cursor.advance(100))
+        self.assertTrue(cursor.at_end())
+        self.assertEqual(-1, cursor.peek())
+        self.assertEqual(-8, cursor.advance(-100))
+        self.assertEqual(0, cursor.index)
+
+    def test_scan_and_substring(self):
+        text = "  foo_bar12 = 3"
+        start = rt.StringCursor(text)
+        self.assertEqual(2, start.scan_over(" \t"))
+        end = start.copy()
+        self.assertEqual(9, end.scan_while(lambda cp: chr(cp).isalnum() or cp == 0x5F))
+        self.assertEqual("foo_bar12", start.substring_to(end))
+        self.assertEqual(0, end.scan_over(""))
+        self.assertEqual(1, end.scan_over([0x20]))
+
+    def test_find_any(self):
+        cursor = rt.StringCursor("a-b]c^d")
+        self.assertTrue(cursor.find_any("]^"))
+        self.assertEqual(3, cursor.index)
+        self.assertTrue(cursor.find_any({0x5E}))
+        self.assertEqual(5, cursor.index)
+        self.assertFalse(cursor.find_any("-"))
+        self.assertTrue(cursor.at_end())
+        self.assertFalse(rt.StringCursor("abc").find_any(""))
+
+    def test_find(self):
+        cursor = rt.StringCursor("x /* y */ z")
+        self.assertTrue(cursor.find("*/"))
+        self.assertEqual(7, cursor.index)
+        self.assertFalse(cursor.find("/*"))
+        self.assertEqual(11, cursor.index)
+
+    def test_substring_needs_same_source(self):
+        left = rt.StringCursor("abc")
+        self.assertRaises(ValueError, lambda: left.substring_to(rt.StringCursor("xyz")))
+
+
+class TestStringFromCodePoints(ut.TestCase):
+    def test_round_trip(self):
+        self.assertEqual(str, rt.string_from_code_points(str_cps))
+        self.assertEqual(str, rt.string_from_code_points(iter(str_cps)))
+        self.assertEqual("", rt.string_from_code_points([]))
+
+    def test_rejects_surrogates(self):
+        for bad in ([0x41, 0xD834, 0xDE0E], [0x110000]):
+            self.assertRaises(ValueError, lambda: rt.string_from_code_points(bad))
+
+    def test_builder(self):
+        builder = rt.CodePointStringBuilder()
+        for cp in str_cps[:3]:
+            builder.append(cp)
+        builder.extend(str_cps[3:])
+        builder.append_string("\U0001F600!")
+        self.assertEqual(10, len(builder))
+        self.assertEqual(str + "\U0001F600!", builder.to_string())
+        self.assertRaises(ValueError, lambda: builder.append(0xDC00))
+        builder.clear()
+        self.assertEqual("", builder.to_string())
+        builder.extend([0xD800])
+        self.assertRaises(ValueError, builder.to_string)
+
+
+class TestStringOffsetIndex(ut.TestCase):
+    text = ("abé世\U0001F600" * 40) + "tail"
+
+    def test_offsets_match_encoding(self):
+        index = rt.StringOffsetIndex(self.text)
+        for i in range(len(self.text) + 1):
+            prefix = self.text[:i]
+            utf8 = len(prefix.encode("utf-8"))
+            utf16 = len(prefix.encode("utf-16-le")) // 2
+            self.assertEqual(utf8, index.utf8_offset(i))
+            self.assertEqual(utf16, index.utf16_offset(i))
+            self.assertEqual(i, index.index_of_utf8(utf8))
+            self.assertEqual(i, index.index_of_utf16(utf16))
+
+    def test_offsets_inside_code_points(self):
+        index = rt.StringOffsetIndex(str)
+        # U+1D20E is index 5, at UTF-16 offset 5 and UTF-8 offset 11.
+        self.assertEqual(5, index.index_of_utf16(6))
+        self.assertEqual(5, index.index_of_utf8(13))
+        self.assertEqual(6, index.index_of_utf8(15))
+        self.assertEqual(len(str), index.index_of_utf8(1000))
+
+    def test_ascii_and_clamping(self):
+        index = rt.StringOffsetIndex("plain")
+        self.assertEqual(3, index.utf8_offset(3))
+        self.assertEqual(5, index.utf16_offset(9))
+        self.assertEqual(0, index.index_of_utf8(-2))
+
+    def test_cache_by_identity(self):
+        index = rt.string_offset_index(self.text)
+        self.assertIs(index, rt.string_offset_index(self.text))
+        # An equal but distinct string gets its own index.
+        copy = "".join(list(self.text))
+        self.assertIsNot(self.text, copy)
+        self.assertIs(copy, rt.string_offset_index(copy).source)